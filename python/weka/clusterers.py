@@ -452,9 +452,11 @@ def avg_silhouette_coefficient(clusterer, dist_func, data):
     # ensure that distance function is initialized with data
     dist_func.instances = data
 
+    # wrap each row only once, the distances below are computed for all pairs
+    insts = [data.get_instance(i) for i in range(data.num_instances)]
     cluster_index_of_inst = []
-    for i in range(data.num_instances):
-        cluster_index_of_inst.append(int(clusterer.cluster_instance(data.get_instance(i))))
+    for inst in insts:
+        cluster_index_of_inst.append(int(clusterer.cluster_instance(inst)))
 
     sum_silhouette_coefficients = 0.0
     for i in range(data.num_instances):
@@ -462,7 +464,7 @@ def avg_silhouette_coefficient(clusterer, dist_func, data):
         average_distance_per_cluster = [0 for x in range(clusterer.number_of_clusters)]
         num_instances_per_cluster = [0 for x in range(clusterer.number_of_clusters)]
         for j in range(data.num_instances):
-            average_distance_per_cluster[cluster_index_of_inst[j]] += dist_func.distance(data.get_instance(i), data.get_instance(j))
+            average_distance_per_cluster[cluster_index_of_inst[j]] += dist_func.distance(insts[i], insts[j])
             num_instances_per_cluster[cluster_index_of_inst[j]] += 1 # Should the current instance be skipped though?
         for k in range(len(average_distance_per_cluster)):
             average_distance_per_cluster[k] /= num_instances_per_cluster[k]
@@ -36,6 +36,9 @@ logger = logging.getLogger("weka.core.classes")
 suggestions = None
 """ dictionary for class -> package relation """
 
+strict_types = os.environ.get("PWW_STRICT", "0") == "1"
+""" whether to check the types of Java objects from trusted code paths as well (environment variable PWW_STRICT=1) """
+
 
 def deepcopy(obj):
     """
@@ -502,15 +505,21 @@ class JavaObject(JSONObject):
         return is_instance_of(jobject, intf_or_class)
         
     @classmethod
-    def enforce_type(cls, jobject, intf_or_class):
+    def enforce_type(cls, jobject, intf_or_class, trusted=False):
         """
         Raises an exception if the object does not implement the specified interface or is not a subclass. 
+        Objects from trusted code paths, i.e., where the Java API already guarantees the type, only get
+        checked if strict_types is enabled.
 
         :param jobject: the Java object to check
         :type jobject: JPype object
         :param intf_or_class: the classname in Java notation (eg "weka.core.DenseInstance")
         :type intf_or_class: str
+        :param trusted: whether the object stems from a trusted code path
+        :type trusted: bool
         """
+        if trusted and not strict_types:
+            return
         if not cls.check_type(jobject, intf_or_class):
             raise TypeError("Object does not implement or subclass " + intf_or_class + ": " + get_classname(jobject))
 
@@ -2011,7 +2020,7 @@ def load_suggestions():
     global suggestions
     if suggestions is not None:
         return
-    filename = jvm.lib_dir() + os.sep + "pkg_suggestions.csv"
+    filename = os.path.join(jvm.lib_dir(), "pkg_suggestions.csv")
     suggestions = {}
     with open(filename) as csvfile:
         csvreader = csv.reader(csvfile)
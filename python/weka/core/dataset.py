@@ -15,8 +15,10 @@
 # Copyright (C) 2014-2024 Fracpete (pythonwekawrapper at gmail dot com)
 
 import logging
+import math
 import numpy as np
-from jpype import JClass
+from functools import cached_property
+from jpype import JClass, JArray, JDouble, JInt
 from weka.core.classes import JavaObject, Random
 import weka.core.typeconv as typeconv
 
@@ -28,20 +30,45 @@ ORDERING_SYMBOLIC = 0
 ORDERING_ORDERED = 1
 ORDERING_MODULO = 2
 
+NUMERIC = 0
+NOMINAL = 1
+STRING = 2
+DATE = 3
+RELATIONAL = 4
+
+_MISSING = float("NaN")
+
+_attribute_class = None
+
+
+def _attribute_jclass():
+    """
+    Returns the weka.core.Attribute class, which only gets looked up once.
+
+    :return: the class
+    :rtype: JClass
+    """
+    global _attribute_class
+    if _attribute_class is None:
+        _attribute_class = JClass("weka.core.Attribute")
+    return _attribute_class
+
 
 class Instances(JavaObject):
     """
     Wrapper class for weka.core.Instances.
     """
     
-    def __init__(self, jobject):
+    def __init__(self, jobject, trusted=False):
         """
         Initializes the weka.core.Instances wrapper.
 
         :param jobject: the weka.core.Instances object to wrap
         :type jobject: JPype object
+        :param trusted: whether the Java object is known to be of the correct type (skips the type check)
+        :type trusted: bool
         """
-        self.enforce_type(jobject, "weka.core.Instances")
+        self.enforce_type(jobject, "weka.core.Instances", trusted=trusted)
         super(Instances, self).__init__(jobject)
 
     def _make_calls(self):
@@ -71,6 +98,16 @@ class Instances(JavaObject):
         """
         return InstanceIterator(self)
 
+    def fast_iter(self):
+        """
+        Returns a generator over the rows, using a snapshot of all rows obtained with a single Java call.
+        Rows added or removed while iterating are not reflected.
+
+        :return: the generator
+        :rtype: generator
+        """
+        return (Instance(inst, trusted=True) for inst in self.jobject.toArray())
+
     def __len__(self):
         """
         Returns the number of rows in the dataset.
@@ -90,9 +127,15 @@ class Instances(JavaObject):
         :rtype: Instance or Instances
         """
         if isinstance(subset, slice):
-            result = Instances.template_instances(self)
-            for i in range(*subset.indices(len(self))):
-                result.add_instance(self.get_instance(i))
+            rows = range(*subset.indices(len(self)))
+            if rows.step == 1:
+                # contiguous range: copied on the Java side
+                return Instances(JClass("weka.core.Instances")(self.jobject, rows.start, len(rows)), trusted=True)
+            result = Instances.template_instances(self, capacity=len(rows))
+            append = result.jobject.add
+            get_instance = self._mc_get_instance
+            for i in rows:
+                append(get_instance(i))
         else:
             result = self.get_instance(subset)
         return result
@@ -142,7 +185,7 @@ class Instances(JavaObject):
         :return: the attribute
         :rtype: Attribute
         """
-        return Attribute(self._mc_attribute(index))
+        return Attribute(self._mc_attribute(index), trusted=True)
 
     def attribute_names(self):
         """
@@ -151,10 +194,8 @@ class Instances(JavaObject):
         :return: list of attribute names
         :rtype: list
         """
-        result = []
-        for i in range(self.num_attributes):
-            result.append(self.attribute(i).name)
-        return result
+        attribute = self._mc_attribute
+        return [attribute(i).name() for i in range(self.num_attributes)]
 
     def attribute_by_name(self, name):
         """
@@ -169,7 +210,7 @@ class Instances(JavaObject):
         if att is None:
             return None
         else:
-            return Attribute(att)
+            return Attribute(att, trusted=True)
 
     def attribute_stats(self, index):
         """
@@ -180,20 +221,17 @@ class Instances(JavaObject):
         :return: the attribute statistics
         :rtype: AttributeStats
         """
-        return AttributeStats(self.jobject.attributeStats(index))
+        return AttributeStats(self.jobject.attributeStats(index), trusted=True)
 
     def values(self, index):
         """
         Returns the internal values of this attribute from all the instance objects.
+        The column gets retrieved from Java in a single call.
 
         :return: the values as numpy array
         :rtype: np.ndarray
         """
-        values = []
-        for i in range(self.num_instances):
-            inst = self.get_instance(i)
-            values.append(inst.get_value(index))
-        return np.array(values)
+        return typeconv.jdouble_array_to_ndarray(self.jobject.attributeToDoubleArray(index))
 
     @property
     def num_instances(self):
@@ -213,7 +251,7 @@ class Instances(JavaObject):
         :return: the class attribute
         :rtype: Attribute
         """
-        return Attribute(self._mc_class_attribute())
+        return Attribute(self._mc_class_attribute(), trusted=True)
 
     @property
     def class_index(self):
@@ -271,7 +309,7 @@ class Instances(JavaObject):
         :return: the instance
         :rtype: Instance
         """
-        return Instance(self._mc_get_instance(index))
+        return Instance(self._mc_get_instance(index), trusted=True)
 
     def add_instance(self, inst, index=None):
         """
@@ -299,7 +337,7 @@ class Instances(JavaObject):
         :rtype: Instance
         """
         return Instance(
-            self._mc_set_instance(index, inst.jobject))
+            self._mc_set_instance(index, inst.jobject), trusted=True)
             
     def delete(self, index=None):
         """
@@ -352,6 +390,32 @@ class Instances(JavaObject):
         """
         self.jobject.deleteWithMissing(index)
 
+    def delete_with_missing_any(self, indices):
+        """
+        Deletes all rows that have a missing value in at least one of the specified attribute indices.
+        Determines the rows to remove in a single pass rather than scanning the data once per attribute.
+
+        :param indices: the attribute indices to check for missing values
+        :type indices: list
+        """
+        if len(indices) == 0:
+            return
+        missing = np.isnan(np.column_stack([self.values(i) for i in indices])).any(axis=1)
+        if not missing.any():
+            return
+        # rebuild the dataset from the rows to keep in one go, rather than deleting row by row
+        rows = list(self.jobject.toArray())
+        keep = JArray(JClass("weka.core.Instance"))([rows[i] for i in np.flatnonzero(~missing)])
+        self.jobject.delete()
+        self.jobject.addAll(JClass("java.util.Arrays").asList(keep))
+
+    def delete_with_missing_all(self):
+        """
+        Deletes all rows that have a missing value in any of the attributes.
+        Equivalent to calling delete_with_missing for each attribute, but scans the data only once.
+        """
+        self.delete_with_missing_any(range(self.num_attributes))
+
     def insert_attribute(self, att, index):
         """
         Inserts the attribute at the specified location.
@@ -410,9 +474,9 @@ class Instances(JavaObject):
         :rtype: Instances
         """
         if random is None:
-            return Instances(self.jobject.trainCV(num_folds, fold))
+            return Instances(self.jobject.trainCV(num_folds, fold), trusted=True)
         else:
-            return Instances(self.jobject.trainCV(num_folds, fold, random.jobject))
+            return Instances(self.jobject.trainCV(num_folds, fold, random.jobject), trusted=True)
 
     def test_cv(self, num_folds, fold):
         """
@@ -425,7 +489,7 @@ class Instances(JavaObject):
         :return: the training fold
         :rtype: Instances
         """
-        return Instances(self.jobject.testCV(num_folds, fold))
+        return Instances(self.jobject.testCV(num_folds, fold), trusted=True)
 
     def equal_headers(self, inst):
         """
@@ -463,10 +527,9 @@ class Instances(JavaObject):
         :rtype: Instances
         """
         if from_row is None or num_rows is None:
-            return Instances(JClass("weka.core.Instances")(dataset.jobject))
+            return Instances(JClass("weka.core.Instances")(dataset.jobject), trusted=True)
         else:
-            dataset = cls.copy_instances(dataset)
-            return Instances(JClass("weka.core.Instances")(dataset.jobject, from_row, num_rows))
+            return Instances(JClass("weka.core.Instances")(dataset.jobject, from_row, num_rows), trusted=True)
 
     @classmethod
     def template_instances(cls, dataset, capacity=0):
@@ -480,7 +543,7 @@ class Instances(JavaObject):
         :return: the empty dataset
         :rtype: Instances
         """
-        return Instances(JClass("weka.core.Instances")(dataset.jobject, capacity))
+        return Instances(JClass("weka.core.Instances")(dataset.jobject, capacity), trusted=True)
 
     @classmethod
     def create_instances(cls, name, atts, capacity):
@@ -496,10 +559,9 @@ class Instances(JavaObject):
         :return: the dataset
         :rtype: Instances
         """
-        attributes = JClass("java.util.ArrayList")()
-        for att in atts:
-            attributes.add(att.jobject)
-        return Instances(JClass("weka.core.Instances")(name, attributes, capacity))
+        jatts = JArray(_attribute_jclass())([att.jobject for att in atts])
+        attributes = JClass("java.util.ArrayList")(JClass("java.util.Arrays").asList(jatts))
+        return Instances(JClass("weka.core.Instances")(name, attributes, capacity), trusted=True)
 
     @classmethod
     def merge_instances(cls, inst1, inst2):
@@ -513,7 +575,7 @@ class Instances(JavaObject):
         :return: the combined dataset
         :rtype: Instances
         """
-        return Instances(JClass("weka.core.Instances").mergeInstances(inst1.jobject, inst2.jobject))
+        return Instances(JClass("weka.core.Instances").mergeInstances(inst1.jobject, inst2.jobject), trusted=True)
 
     @classmethod
     def append_instances(cls, inst1, inst2):
@@ -531,8 +593,7 @@ class Instances(JavaObject):
         if msg is not None:
             raise Exception("Cannot appent instances: " + msg)
         result = cls.copy_instances(inst1)
-        for i in range(inst2.num_instances):
-            result.add_instance(inst2.get_instance(i))
+        result.jobject.addAll(inst2.jobject)
         return result
 
     def train_test_split(self, percentage, rnd=None):
@@ -563,7 +624,8 @@ class Instances(JavaObject):
     def cv_splits(self, folds=10, rnd=None, stratify=True):
         """
         Generates a list of train/test pairs used in cross-validation.
-        Creates a copy of the dataset beforehand when randomizing.
+        Creates a copy of the dataset beforehand when randomizing. The data gets randomized only once,
+        the training folds themselves are not shuffled again.
 
         :param folds: the number of folds to use, >= 2
         :type folds: int
@@ -584,7 +646,7 @@ class Instances(JavaObject):
             data = self
 
         for i in range(folds):
-            train = data.train_cv(folds, i, random=rnd)
+            train = data.train_cv(folds, i)
             test = data.test_cv(folds, i)
             result.append((train, test))
 
@@ -647,18 +709,23 @@ class Instances(JavaObject):
         if (col_range is None) and (row_range is None):
             return Instances.copy_instances(self)
 
-        multi = MultiFilter()
-        multi.clear()
+        filters = []
         if col_range is not None:
             remove = Filter(classname="weka.filters.unsupervised.attribute.Remove",
                             options=["-R", col_range, ("-V" if not invert_cols else "")])
-            multi.append(remove)
+            filters.append(remove)
         if row_range is not None:
             remove = Filter(classname="weka.filters.unsupervised.instance.RemoveRange",
                             options=["-R", row_range, ("-V" if not invert_rows else "")])
-            multi.append(remove)
-        multi.inputformat(self)
-        result = multi.filter(self)
+            filters.append(remove)
+        # only use MultiFilter if both, columns and rows, need removing
+        if len(filters) == 1:
+            fltr = filters[0]
+        else:
+            fltr = MultiFilter()
+            fltr.filters = filters
+        fltr.inputformat(self)
+        result = fltr.filter(self)
 
         if keep_relationame:
             result.relationname = old_relationname
@@ -674,39 +741,41 @@ class Instances(JavaObject):
         :return: the dataset as matrix
         :rtype: np.ndarray
         """
-        names = []
-        for n in range(self.num_attributes):
-            names.append(self.attribute(n).name)
-
         if internal:
-            result = np.empty((self.num_instances, self.num_attributes))
-            for i in range(self.num_instances):
-                values = self.get_instance(i).values
-                for n in range(len(values)):
-                    result[i, n] = values[n]
+            num_instances = self.num_instances
+            num_attributes = self.num_attributes
+            result = np.empty((num_instances, num_attributes))
+            # transfer along the shorter dimension to minimize the number of Java calls
+            if num_attributes < num_instances:
+                column = self.jobject.attributeToDoubleArray
+                for n in range(num_attributes):
+                    result[:, n] = column(n)
+            else:
+                get_instance = self._mc_get_instance
+                for i in range(num_instances):
+                    result[i, :] = get_instance(i).toDoubleArray()
             return result
         else:
-            numeric = []
-            formats = []
-            for n in range(self.num_attributes):
-                if self.attribute(n).is_numeric:
-                    numeric.append(True)
-                    formats.append("float64")
+            num_instances = self.num_instances
+            atts = [self.attribute(n) for n in range(self.num_attributes)]
+            formats = ["float64" if att.is_numeric else "object" for att in atts]
+            result = np.empty((num_instances, ), dtype=",".join(formats))
+            fields = result.dtype.names
+            # filled column by column, using the internal values
+            for n, att in enumerate(atts):
+                column = self.values(n)
+                if att.is_nominal or att.is_string:
+                    labels = np.array(att.values + ["?"], dtype=object)
+                    column = labels[np.where(np.isnan(column), len(labels) - 1, column).astype(int)]
+                elif not att.is_numeric:
+                    column = np.empty(num_instances, dtype=object)
+                    get_instance = self._mc_get_instance
+                    for i in range(num_instances):
+                        column[i] = get_instance(i).stringValue(n)
+                if fields is None:
+                    result[:] = column
                 else:
-                    numeric.append(False)
-                    formats.append("object")
-            result = np.empty((self.num_instances, ), dtype=",".join(formats))
-            data = []
-            for i in range(self.num_instances):
-                inst = self.get_instance(i)
-                row = []
-                for n in range(self.num_attributes):
-                    if numeric[n]:
-                        row.append(inst.get_value(n))
-                    else:
-                        row.append(inst.get_string_value(n))
-                data.append(tuple(row))
-            result[:] = data
+                    result[fields[n]] = column
             return result
 
 
@@ -715,14 +784,16 @@ class Instance(JavaObject):
     Wrapper class for weka.core.Instance.
     """
     
-    def __init__(self, jobject):
+    def __init__(self, jobject, trusted=False):
         """
         Initializes the weka.core.Instance wrapper.
 
         :param jobject: the weka.core.Instance object to initialize with
         :type jobject: JPype object
+        :param trusted: whether the Java object is known to be of the correct type (skips the type check)
+        :type trusted: bool
         """
-        self.enforce_type(jobject, "weka.core.Instance")
+        self.enforce_type(jobject, "weka.core.Instance", trusted=trusted)
         super(Instance, self).__init__(jobject)
 
     def _make_calls(self):
@@ -739,6 +810,7 @@ class Instance(JavaObject):
         self._mc_get_weight = self.jobject.weight
         self._mc_is_missing = self.jobject.isMissing
         self._mc_class_index = self.jobject.classIndex
+        self._mc_to_double_array = self.jobject.toDoubleArray
 
     def __iter__(self):
         """
@@ -761,7 +833,7 @@ class Instance(JavaObject):
         if dataset is None:
             return None
         else:
-            return Instances(dataset)
+            return Instances(dataset, trusted=True)
 
     @dataset.setter
     def dataset(self, dataset):
@@ -801,7 +873,7 @@ class Instance(JavaObject):
         :return: the class attribute
         :rtype: Attribute
         """
-        return Attribute(self.jobject.classAttribute())
+        return Attribute(self.jobject.classAttribute(), trusted=True)
 
     @property
     def class_index(self):
@@ -875,7 +947,7 @@ class Instance(JavaObject):
         :return: the relational value
         :rtype: Instances
         """
-        return Instances(self.jobject.relationalValue(index))
+        return Instances(self.jobject.relationalValue(index), trusted=True)
 
     def set_missing(self, index):
         """
@@ -934,7 +1006,7 @@ class Instance(JavaObject):
         :return: the values as numpy array
         :rtype: ndarray
         """
-        return typeconv.jdouble_array_to_ndarray(self.jobject.toDoubleArray())
+        return typeconv.jdouble_array_to_ndarray(self._mc_to_double_array())
 
     @classmethod
     def create_instance(cls, values, classname="weka.core.DenseInstance", weight=1.0):
@@ -955,10 +1027,10 @@ class Instance(JavaObject):
         """
         Creates a new sparse instance.
 
-        :param values: the list of tuples (0-based index and internal format float). The indices of the
-                       tuples must be in ascending order and "max_values" must be set to the maximum
-                       number of attributes in the dataset.
-        :type values: list
+        :param values: the list of tuples (0-based index and internal format float) or a tuple of two numpy
+                       arrays (0-based indices, internal format floats). The indices must be in ascending
+                       order and "max_values" must be set to the maximum number of attributes in the dataset.
+        :type values: list or tuple
         :param max_values: the maximum number of attributes
         :type max_values: int
         :param classname: the classname of the instance (eg weka.core.SparseInstance).
@@ -966,12 +1038,15 @@ class Instance(JavaObject):
         :param weight: the weight of the instance
         :type weight: float
         """
-        indices = []
-        vals = []
-        for (i, v) in values:
-            indices.append(i)
-            vals.append(float(v))
-        return Instance(JClass(classname)(weight, typeconv.to_jdouble_array(vals), typeconv.to_jint_array(indices), max_values))
+        if isinstance(values, tuple) and (len(values) == 2) and isinstance(values[0], np.ndarray):
+            indices = np.ascontiguousarray(values[0], dtype=np.int32)
+            vals = np.ascontiguousarray(values[1], dtype=np.float64)
+        else:
+            # materialize first, as generators/iterators have no length
+            pairs = np.array(list(values), dtype=np.float64).reshape(-1, 2)
+            indices = np.ascontiguousarray(pairs[:, 0], dtype=np.int32)
+            vals = np.ascontiguousarray(pairs[:, 1])
+        return Instance(JClass(classname)(weight, JArray.of(vals, JDouble), JArray.of(indices, JInt), max_values))
 
     @classmethod
     def missing_value(cls):
@@ -981,7 +1056,7 @@ class Instance(JavaObject):
         :return: missing value
         :rtype: float
         """
-        return missing_value()
+        return _MISSING
 
     def to_numpy(self, internal=False):
         """
@@ -992,31 +1067,22 @@ class Instance(JavaObject):
         :return: the dataset as matrix with single row
         :rtype: np.ndarray
         """
-        names = []
-        for n in range(self.num_attributes):
-            names.append(self.dataset.attribute(n).name)
-
         if internal:
-            result = np.empty((1, self.num_attributes))
-            values = self.values
-            for n in range(len(values)):
-                result[0, n] = values[n]
-            return result
+            return self.values.reshape(1, -1)
         else:
-            numeric = []
-            formats = []
-            for n in range(self.dataset.num_attributes):
-                if self.dataset.attribute(n).is_numeric:
-                    numeric.append(True)
-                    formats.append("float64")
-                else:
-                    numeric.append(False)
-                    formats.append("object")
+            dataset = self.dataset
+            num_attributes = dataset.num_attributes
+            numeric = [dataset.attribute(n).is_numeric for n in range(num_attributes)]
+            formats = ["float64" if num else "object" for num in numeric]
+            values = self.values
+            if all(numeric):
+                # all fields are float64, i.e., same memory layout as the internal values
+                return np.ascontiguousarray(values).view(",".join(formats))
             result = np.empty((1, ), dtype=",".join(formats))
             row = []
-            for n in range(self.num_attributes):
+            for n in range(num_attributes):
                 if numeric[n]:
-                    row.append(self.get_value(n))
+                    row.append(values[n])
                 else:
                     row.append(self.get_string_value(n))
             result[0] = tuple(row)
@@ -1028,24 +1094,43 @@ class Attribute(JavaObject):
     Wrapper class for weka.core.Attribute.
     """
     
-    def __init__(self, jobject):
+    def __init__(self, jobject, trusted=False):
         """
         Initializes the weka.core.Attribute wrapper.
         :param jobject: the JPype object
         :type jobject: JPype object
+        :param trusted: whether the Java object is known to be of the correct type (skips the type check)
+        :type trusted: bool
         """
-        self.enforce_type(jobject, "weka.core.Attribute")
+        self.enforce_type(jobject, "weka.core.Attribute", trusted=trusted)
         super(Attribute, self).__init__(jobject)
+        self._name = None
+        self._type = None
+        self._averagable = None
+        self._labels = None
+
+    def _make_calls(self):
+        """
+        Method for obtaining method instances for faster access.
+        Members must start with "_mc_"
+        """
+        super(Attribute, self)._make_calls()
+        self._mc_value = self.jobject.value
+        self._mc_index_of = self.jobject.indexOfValue
+        self._mc_add_string_value = self.jobject.addStringValue
 
     @property
     def name(self):
         """
         Returns the name of the attribute.
+        The name gets only retrieved once, as it cannot change (renaming creates a new attribute).
 
         :return: the name
         :rtype: str
         """
-        return self.jobject.name()
+        if self._name is None:
+            self._name = self.jobject.name()
+        return self._name
         
     @property
     def index(self):
@@ -1086,7 +1171,7 @@ class Attribute(JavaObject):
         :return: the 0-based index
         :rtype: int
         """
-        return self.jobject.indexOfValue(label)
+        return self._mc_index_of(label)
 
     def value(self, index):
         """
@@ -1097,7 +1182,7 @@ class Attribute(JavaObject):
         :return: the label
         :rtype: str
         """
-        return self.jobject.value(index)
+        return self._mc_value(index)
 
     @property
     def num_values(self):
@@ -1113,15 +1198,21 @@ class Attribute(JavaObject):
     def values(self):
         """
         Returns the labels, strings or relation-values.
+        The labels of nominal attributes get only retrieved once, as they cannot change.
 
         :return: all the values, None if not NOMINAL, STRING, or RELATION
         :rtype: list
         """
+        if self._labels is not None:
+            return list(self._labels)
         enm = self.jobject.enumerateValues()
         if enm is None:
             return None
-        else:
-            return typeconv.jenumeration_to_list(enm)
+        result = list(JClass("java.util.Collections").list(enm).toArray())
+        if self.is_nominal:
+            self._labels = result
+            return list(result)
+        return result
 
     @property
     def ordering(self):
@@ -1136,12 +1227,15 @@ class Attribute(JavaObject):
     @property
     def type(self):
         """
-        Returns the type of the attribute. See weka.core.Attribute Javadoc.
+        Returns the type of the attribute (NUMERIC, NOMINAL, STRING, DATE, RELATIONAL). See weka.core.Attribute Javadoc.
+        The type gets only retrieved once, as it cannot change.
 
         :return: the type
         :rtype: int
         """
-        return self.jobject.type()
+        if self._type is None:
+            self._type = self.jobject.type()
+        return self._type
 
     def type_str(self, short=False):
         """
@@ -1151,19 +1245,22 @@ class Attribute(JavaObject):
         :rtype: str
         """
         if short:
-            return JClass("weka.core.Attribute").typeToStringShort(self.jobject)
+            return _attribute_jclass().typeToStringShort(self.jobject)
         else:
-            return JClass("weka.core.Attribute").typeToString(self.jobject)
+            return _attribute_jclass().typeToString(self.jobject)
 
     @property
     def is_averagable(self):
         """
         Returns whether the attribute is averagable.
+        Only gets retrieved once, as it depends on the type of the attribute.
 
         :return: whether averagable
         :rtype: bool
         """
-        return self.jobject.isAveragable()
+        if self._averagable is None:
+            self._averagable = self.jobject.isAveragable()
+        return self._averagable
 
     @property
     def is_date(self):
@@ -1173,7 +1270,7 @@ class Attribute(JavaObject):
         :return: whether date attribute
         :rtype: bool
         """
-        return self.jobject.isDate()
+        return self.type == DATE
 
     @property
     def is_nominal(self):
@@ -1183,7 +1280,7 @@ class Attribute(JavaObject):
         :return: whether nominal attribute
         :rtype: bool
         """
-        return self.jobject.isNominal()
+        return self.type == NOMINAL
 
     @property
     def is_numeric(self):
@@ -1193,7 +1290,7 @@ class Attribute(JavaObject):
         :return: whether numeric attribute
         :rtype: bool
         """
-        return self.jobject.isNumeric()
+        return self.type in (NUMERIC, DATE)
 
     @property
     def is_relation_valued(self):
@@ -1203,7 +1300,7 @@ class Attribute(JavaObject):
         :return: whether relation valued attribute
         :rtype: bool
         """
-        return self.jobject.isRelationValued()
+        return self.type == RELATIONAL
 
     @property
     def is_string(self):
@@ -1213,7 +1310,7 @@ class Attribute(JavaObject):
         :return: whether string attribute
         :rtype: bool
         """
-        return self.jobject.isString()
+        return self.type == STRING
 
     @property
     def date_format(self):
@@ -1265,7 +1362,7 @@ class Attribute(JavaObject):
         :return: the index
         :rtype: int
         """
-        return self.jobject.addStringValue(s)
+        return self._mc_add_string_value(s)
 
     def add_relation(self, instances):
         """
@@ -1322,9 +1419,9 @@ class Attribute(JavaObject):
         :rtype: Attribute
         """
         if name is None:
-            return Attribute(self.jobject.copy())
+            return Attribute(self.jobject.copy(), trusted=True)
         else:
-            return Attribute(self.jobject.copy(name))
+            return Attribute(self.jobject.copy(name), trusted=True)
 
     @classmethod
     def create_numeric(cls, name):
@@ -1334,7 +1431,7 @@ class Attribute(JavaObject):
         :param name: the name of the attribute
         :type name: str
         """
-        return Attribute(JClass("weka.core.Attribute")(name))
+        return Attribute(_attribute_jclass()(name), trusted=True)
 
     @classmethod
     def create_date(cls, name, formt="yyyy-MM-dd'T'HH:mm:ss"):
@@ -1346,7 +1443,7 @@ class Attribute(JavaObject):
         :param formt: the date format, see Javadoc for java.text.SimpleDateFormat
         :type formt: str
         """
-        return Attribute(JClass("weka.core.Attribute")(name, formt))
+        return Attribute(_attribute_jclass()(name, formt), trusted=True)
 
     @classmethod
     def create_nominal(cls, name, labels):
@@ -1358,7 +1455,7 @@ class Attribute(JavaObject):
         :param labels: the list of string labels to use
         :type labels: list
         """
-        return Attribute(JClass("weka.core.Attribute")(name, typeconv.string_list_to_jlist(labels)))
+        return Attribute(_attribute_jclass()(name, typeconv.string_list_to_jlist(labels)), trusted=True)
 
     @classmethod
     def create_string(cls, name):
@@ -1368,7 +1465,7 @@ class Attribute(JavaObject):
         :param name: the name of the attribute
         :type name: str
         """
-        return Attribute(JClass("weka.core.Attribute")(name, True))
+        return Attribute(_attribute_jclass()(name, True), trusted=True)
 
     @classmethod
     def create_relational(cls, name, inst):
@@ -1380,25 +1477,27 @@ class Attribute(JavaObject):
         :param inst: the structure of the relational attribute
         :type inst: Instances
         """
-        return Attribute(JClass("weka.core.Attribute")(name, inst.jobject))
+        return Attribute(_attribute_jclass()(name, inst.jobject), trusted=True)
 
 
 class AttributeStats(JavaObject):
     """
-    Container for attribute statistics.
+    Container for attribute statistics. The statistics are read from the Java object on first access only.
     """
 
-    def __init__(self, jobject):
+    def __init__(self, jobject, trusted=False):
         """
         Initializes the container.
 
         :param jobject: The Java object to wrap
         :type jobject: JPype object
+        :param trusted: whether the Java object is known to be of the correct type (skips the type check)
+        :type trusted: bool
         """
-        self.enforce_type(jobject, "weka.core.AttributeStats")
+        self.enforce_type(jobject, "weka.core.AttributeStats", trusted=trusted)
         super(AttributeStats, self).__init__(jobject)
 
-    @property
+    @cached_property
     def distinct_count(self):
         """
         The number of distinct values.
@@ -1408,7 +1507,7 @@ class AttributeStats(JavaObject):
         """
         return self.jobject.distinctCount
 
-    @property
+    @cached_property
     def int_count(self):
         """
         The number of int-like values.
@@ -1418,7 +1517,7 @@ class AttributeStats(JavaObject):
         """
         return self.jobject.intCount
 
-    @property
+    @cached_property
     def missing_count(self):
         """
         The number of missing values.
@@ -1428,27 +1527,35 @@ class AttributeStats(JavaObject):
         """
         return self.jobject.missingCount
 
-    @property
+    @cached_property
     def nominal_counts(self):
         """
         Counts of each nominal value.
 
-        :return: Counts of each nominal value
+        :return: Counts of each nominal value (int32, read-only), None if not a nominal attribute
         :rtype: ndarray
         """
-        return typeconv.jint_array_to_ndarray(self.jobject.nominalCounts)
+        counts = self.jobject.nominalCounts
+        if counts is None:
+            return None
+        result = np.array(counts, dtype=np.int32)
+        result.setflags(write=False)
+        return result
 
-    @property
+    @cached_property
     def nominal_weights(self):
         """
         Weight mass for each nominal value.
 
-        :return: Weight mass for each nominal value
+        :return: Weight mass for each nominal value (float64, read-only), None if not a nominal attribute
         :rtype: ndarray
         """
-        return typeconv.jdouble_array_to_ndarray(self.jobject.nominalWeights)
+        result = typeconv.jdouble_array_to_ndarray(self.jobject.nominalWeights)
+        if result is not None:
+            result.setflags(write=False)
+        return result
 
-    @property
+    @cached_property
     def numeric_stats(self):
         """
         Stats on numeric value distributions.
@@ -1456,9 +1563,9 @@ class AttributeStats(JavaObject):
         :return: Stats on numeric value distributions
         :rtype: NumericStats
         """
-        return Stats(self.jobject.numericStats)
+        return Stats(self.jobject.numericStats, trusted=True)
 
-    @property
+    @cached_property
     def total_count(self):
         """
         The total number of values.
@@ -1468,7 +1575,7 @@ class AttributeStats(JavaObject):
         """
         return self.jobject.totalCount
 
-    @property
+    @cached_property
     def unique_count(self):
         """
         The number of values that only appear once.
@@ -1481,20 +1588,22 @@ class AttributeStats(JavaObject):
 
 class Stats(JavaObject):
     """
-    Container for numeric attribute stats.
+    Container for numeric attribute stats. The stats are read from the Java object on first access only.
     """
 
-    def __init__(self, jobject):
+    def __init__(self, jobject, trusted=False):
         """
         Initializes the container.
 
         :param jobject: The Java object to wrap
         :type jobject: JPype object
+        :param trusted: whether the Java object is known to be of the correct type (skips the type check)
+        :type trusted: bool
         """
-        self.enforce_type(jobject, "weka.experiment.Stats")
+        self.enforce_type(jobject, "weka.experiment.Stats", trusted=trusted)
         super(Stats, self).__init__(jobject)
 
-    @property
+    @cached_property
     def count(self):
         """
         The number of values seen.
@@ -1504,7 +1613,7 @@ class Stats(JavaObject):
         """
         return self.jobject.count
 
-    @property
+    @cached_property
     def min(self):
         """
         The minimum value seen, or Double.NaN if no values seen.
@@ -1514,7 +1623,7 @@ class Stats(JavaObject):
         """
         return self.jobject.min
 
-    @property
+    @cached_property
     def max(self):
         """
         The maximum value seen, or Double.NaN if no values seen.
@@ -1524,7 +1633,7 @@ class Stats(JavaObject):
         """
         return self.jobject.max
 
-    @property
+    @cached_property
     def mean(self):
         """
         The mean of values at the last calculateDerived() call.
@@ -1534,7 +1643,7 @@ class Stats(JavaObject):
         """
         return self.jobject.mean
 
-    @property
+    @cached_property
     def stddev(self):
         """
         The std deviation of values at the last calculateDerived() call.
@@ -1544,7 +1653,7 @@ class Stats(JavaObject):
         """
         return self.jobject.stdDev
 
-    @property
+    @cached_property
     def sum(self):
         """
         The sum of values seen.
@@ -1554,7 +1663,7 @@ class Stats(JavaObject):
         """
         return self.jobject.sum
 
-    @property
+    @cached_property
     def sumsq(self):
         """
         The sum of values squared seen.
@@ -1568,6 +1677,8 @@ class Stats(JavaObject):
 class InstanceIterator(object):
     """
     Iterator for rows in an Instances object.
+    The number of rows is determined when the iterator gets created, i.e., rows must not get
+    deleted from the dataset while iterating over it.
     """
     def __init__(self, data):
         """
@@ -1578,6 +1689,8 @@ class InstanceIterator(object):
         """
         self.data = data
         self.row = 0
+        # the number of rows only gets determined once
+        self.num_instances = data.num_instances
 
     def __iter__(self):
         """
@@ -1592,7 +1705,7 @@ class InstanceIterator(object):
         :return: the next Instance object
         :rtype: Instance
         """
-        if self.row < self.data.num_instances:
+        if self.row < self.num_instances:
             index = self.row
             self.row += 1
             return self.data.get_instance(index)
@@ -1603,6 +1716,8 @@ class InstanceIterator(object):
 class AttributeIterator(object):
     """
     Iterator for attributes in an Instances object.
+    The number of attributes is determined when the iterator gets created, i.e., attributes must not
+    get deleted from the dataset while iterating over it.
     """
     def __init__(self, data):
         """
@@ -1613,6 +1728,8 @@ class AttributeIterator(object):
         """
         self.data = data
         self.col = 0
+        # the number of attributes only gets determined once
+        self.num_attributes = data.num_attributes
 
     def __iter__(self):
         """
@@ -1627,7 +1744,7 @@ class AttributeIterator(object):
         :return: the next Attribute object
         :rtype: Attribute
         """
-        if self.col < self.data.num_attributes:
+        if self.col < self.num_attributes:
             index = self.col
             self.col += 1
             return self.data.attribute(index)
@@ -1648,6 +1765,18 @@ class InstanceValueIterator(object):
         """
         self.data = data
         self.col = 0
+        # fetch values and attributes once, rather than for each value
+        self.values = data.values
+        self.num_attributes = len(self.values)
+        dataset = data.dataset
+        if dataset is None:
+            self.attributes = None
+            self.numeric = [True] * self.num_attributes
+            self.labels = [False] * self.num_attributes
+        else:
+            self.attributes = [dataset.attribute(i) for i in range(self.num_attributes)]
+            self.numeric = [att.is_numeric for att in self.attributes]
+            self.labels = [att.is_nominal or att.is_string for att in self.attributes]
 
     def __iter__(self):
         """
@@ -1662,11 +1791,14 @@ class InstanceValueIterator(object):
         :return: the next value, depending on the attribute that can be either a number of a string
         :rtype: str or float
         """
-        if self.col < self.data.num_attributes:
+        if self.col < self.num_attributes:
             index = self.col
             self.col += 1
-            if self.data.dataset.attribute(index).is_numeric:
-                return self.data.get_value(index)
+            value = self.values[index]
+            if self.numeric[index]:
+                return value
+            elif self.labels[index] and (value == value):
+                return self.attributes[index].value(int(value))
             else:
                 return self.data.get_string_value(index)
         else:
@@ -1684,17 +1816,177 @@ def check_col_names_unique(cols_x, col_y=None):
     :return: None if check passed, otherwise error message
     :rtype: str
     """
-    names = set()
-    for i, name in enumerate(cols_x):
-        if name in names:
-            return "Input variable name at #%d is already present: %s" % (i, name)
-        names.add(name)
+    names = set(cols_x)
+    if len(names) < len(cols_x):
+        # locate the first duplicate
+        names = set()
+        for i, name in enumerate(cols_x):
+            if name in names:
+                return "Input variable name at #%d is already present: %s" % (i, name)
+            names.add(name)
     if col_y is not None:
         if col_y in names:
             return "Output variable name is already present: %s" % col_y
     return None
 
 
+TYPE_CODES = {
+    float: "N",
+    int: "N",
+    bool: "N",
+    np.float64: "N",
+    np.float32: "N",
+    np.int64: "N",
+    np.int32: "N",
+    bytes: "B",
+    np.bytes_: "B",
+    str: "S",
+    np.str_: "S",
+}
+""" the type codes (N=numeric, B=bytes, S=string) for the types supported by create_instances_from_lists """
+
+
+def _type_code(value):
+    """
+    Determines the type code for the value (N=numeric, B=bytes, S=string), using the TYPE_CODES lookup
+    and falling back on isinstance checks for subclasses.
+
+    :param value: the value to determine the type code for
+    :return: the type code, None if not supported
+    :rtype: str
+    """
+    result = TYPE_CODES.get(type(value))
+    if result is None:
+        if isinstance(value, (float, int)):
+            result = "N"
+        elif isinstance(value, bytes):
+            result = "B"
+        elif isinstance(value, str):
+            result = "S"
+    return result
+
+
+def _index_cache(att):
+    """
+    Creates the cache (string -> index) for the attribute, used by _string_index. For nominal
+    attributes, the cache is prefilled with all the labels, avoiding any lookups in Java.
+
+    :param att: the attribute to create the cache for
+    :type att: Attribute
+    :return: the cache
+    :rtype: dict
+    """
+    if att.is_nominal:
+        return {label: i for i, label in enumerate(att.values)}
+    return dict()
+
+
+def _string_index(att, cache, s, nominal=False):
+    """
+    Returns the internal value for the string, either the index of the label (nominal attribute)
+    or the index of the added string value (string attribute). Uses the cache to avoid repeated
+    lookups of the same string.
+
+    :param att: the attribute
+    :type att: Attribute
+    :param cache: the cache for the attribute (string -> index), see _index_cache
+    :type cache: dict
+    :param s: the string to get the index for
+    :type s: str
+    :param nominal: whether the attribute is nominal or a string one
+    :type nominal: bool
+    :return: the index
+    :rtype: int
+    """
+    result = cache.get(s)
+    if result is None:
+        if nominal:
+            result = att.index_of(s)
+        else:
+            result = att.add_string_value(s)
+        cache[s] = result
+    return result
+
+
+def _is_missing(value):
+    """
+    Checks whether the value of a string/bytes/nominal column represents a missing value (None or nan).
+
+    :param value: the value to check
+    :return: whether missing
+    :rtype: bool
+    """
+    return (value is None) or (isinstance(value, float) and math.isnan(value))
+
+
+def _encode_column(data, index, values, type_code, out):
+    """
+    Turns the string/bytes/nominal values of a column into their internal format, None and nan values
+    are interpreted as missing values.
+
+    :param data: the dataset with the attribute
+    :type data: Instances
+    :param index: the 0-based index of the attribute
+    :type index: int
+    :param values: the values of the column
+    :type values: np.ndarray or list
+    :param type_code: the type of the column (S, B, C)
+    :type type_code: str
+    :param out: the array to store the internal values in
+    :type out: np.ndarray
+    """
+    missing = missing_value()
+    att = data.attribute(index)
+    cache = _index_cache(att)
+    nominal = (type_code == "C")
+    convert = type_code != "S"
+    for i, value in enumerate(values):
+        if _is_missing(value):
+            out[i] = missing
+        elif convert:
+            out[i] = _string_index(att, cache, typeconv.to_string(value), nominal=nominal)
+        else:
+            out[i] = _string_index(att, cache, value)
+
+
+def _nominal_labels(values):
+    """
+    Determines the sorted, unique labels of a column to be turned into a nominal attribute.
+    Numpy arrays (apart from object ones) get reduced to their unique values first.
+    Missing values (None, nan) are not turned into labels, see _encode_column.
+
+    :param values: the column values
+    :type values: list or np.ndarray
+    :return: the sorted labels
+    :rtype: list
+    """
+    if isinstance(values, np.ndarray) and (values.dtype != object):
+        if values.dtype.kind == "f":
+            values = values[~np.isnan(values)]
+        values = np.unique(values).tolist()
+    return sorted(set(typeconv.to_string(value) for value in values if not _is_missing(value)))
+
+
+def _numeric_array(values, ndim):
+    """
+    Converts the list(s) into a float64 numpy array, if all values are numbers.
+
+    :param values: the list (ndim=1) or list of lists (ndim=2) to convert
+    :type values: list
+    :param ndim: the expected number of dimensions
+    :type ndim: int
+    :return: the array, None if not purely numeric or not of the expected dimensions (eg ragged lists)
+    :rtype: np.ndarray
+    """
+    try:
+        result = np.asarray(values)
+    except ValueError:
+        return None
+    if (result.ndim != ndim) or (result.dtype.kind not in "fiu"):
+        return None
+    return np.ascontiguousarray(result, dtype=np.float64)
+
+
 def create_instances_from_lists(x, y=None, name="data", cols_x=None, col_y=None, nominal_x=None, nominal_y=False):
     """
     Allows the generation of an Instances object from a list of lists for X and a list for Y (optional).
@@ -1723,6 +2015,13 @@ def create_instances_from_lists(x, y=None, name="data", cols_x=None, col_y=None,
         if len(x) != len(y):
             raise Exception("Dimensions of x and y differ: " + str(len(x)) + " != " + str(len(y)))
 
+    # purely numeric data? use matrix code instead of inspecting each value
+    if (nominal_x is None) and not nominal_y:
+        arr_x = _numeric_array(x, 2)
+        arr_y = None if y is None else _numeric_array(y, 1)
+        if (arr_x is not None) and ((y is None) or (arr_y is not None)):
+            return create_instances_from_matrices(arr_x, y=arr_y, name=name, cols_x=cols_x, col_y=col_y)
+
     # column names
     if cols_x is None:
         cols_x = []
@@ -1738,12 +2037,13 @@ def create_instances_from_lists(x, y=None, name="data", cols_x=None, col_y=None,
     # nominal x columns?
     nominal_x_values = None
     if nominal_x is not None:
-        nominal_x_values = dict()
-        for nominal_col in nominal_x:
-            labels = set()
-            for n in range(len(x)):
-                labels.add(typeconv.to_string(x[n][nominal_col]))
-            nominal_x_values[nominal_col] = sorted(list(labels))
+        labels = {nominal_col: set() for nominal_col in nominal_x}
+        for row in x:
+            for nominal_col, col_labels in labels.items():
+                # missing values don't make it into the labels, see _encode_column
+                if not _is_missing(row[nominal_col]):
+                    col_labels.add(typeconv.to_string(row[nominal_col]))
+        nominal_x_values = {nominal_col: sorted(col_labels) for nominal_col, col_labels in labels.items()}
 
     # create header
     atts = []
@@ -1757,17 +2057,10 @@ def create_instances_from_lists(x, y=None, name="data", cols_x=None, col_y=None,
             if (nominal_x_values is not None) and (i in nominal_x_values):
                 type_x[i] = "C"
                 break
-            if isinstance(x[n][i], float) or isinstance(x[n][i], int):
-                type_x[i] = "N"
-                break
-            elif isinstance(x[n][i], bytes):
-                type_x[i] = "B"
-                break
-            elif isinstance(x[n][i], str):
-                type_x[i] = "S"
-                break
-            else:
-                raise Exception("Only float, int, bytes and str are supported, #" + str(i) + ": " + str(type(x[i][0])))
+            type_x[i] = _type_code(x[n][i])
+            if type_x[i] is None:
+                raise Exception("Only float, int, bytes and str are supported, #" + str(i) + ": " + str(type(x[n][i])))
+            break
 
     for i in range(len(type_x)):
         if type_x[i] == "N":
@@ -1787,10 +2080,7 @@ def create_instances_from_lists(x, y=None, name="data", cols_x=None, col_y=None,
         # nominal y column?
         nominal_y_values = None
         if nominal_y:
-            labels = set()
-            for n in range(len(y)):
-                labels.add(typeconv.to_string(y[n]))
-            nominal_y_values = sorted(list(labels))
+            nominal_y_values = _nominal_labels(y)
 
         for n in range(len(y)):
             if y[n] is None:
@@ -1799,55 +2089,33 @@ def create_instances_from_lists(x, y=None, name="data", cols_x=None, col_y=None,
                 type_y = "C"
                 atts.append(Attribute.create_nominal(col_y, nominal_y_values))
                 break
-            if isinstance(y[n], float) or isinstance(y[n], int):
-                type_y = "N"
+            type_y = _type_code(y[n])
+            if type_y == "N":
                 atts.append(Attribute.create_numeric(col_y))
-                break
-            elif isinstance(y[n], bytes):
-                type_y = "B"
-                atts.append(Attribute.create_string(col_y))
-                break
-            elif isinstance(y[n], str):
-                type_y = "S"
+            elif type_y is not None:
                 atts.append(Attribute.create_string(col_y))
-                break
             else:
-                raise Exception("Only float, int, bytes and str are supported for y: " + str(type(y[0])))
+                raise Exception("Only float, int, bytes and str are supported for y: " + str(type(y[n])))
+            break
 
     result = Instances.create_instances(name, atts, len(x))
 
-    # add data
-    nan = float("nan")
-    for i in range(len(x)):
-        values = []
-
-        for n in range(len(x[i])):
-            if x[i][n] == nan:
-                values.append(x[i][n])
-                continue
-            if type_x[n] == "N":
-                values.append(x[i][n])
-            elif type_x[n] == "B":
-                values.append(result.attribute(n).add_string_value(typeconv.to_string(x[i][n])))
-            elif type_x[n] == "C":
-                values.append(result.attribute(n).index_of(typeconv.to_string(x[i][n])))
-            else:
-                values.append(result.attribute(n).add_string_value(x[i][n]))
-
-        if y is not None:
-            if y[i] == nan:
-                values.append(y[i])
-                continue
-            if type_y == "N":
-                values.append(y[i])
-            elif type_y == "B":
-                values.append(result.attribute(result.num_attributes - 1).add_string_value(typeconv.to_string(y[i])))
-            elif type_y == "C":
-                values.append(result.attribute(result.num_attributes - 1).index_of(typeconv.to_string(y[i])))
-            else:
-                values.append(result.attribute(result.num_attributes - 1).add_string_value(y[i]))
+    # add data, dispatching on the type once per column rather than for each value
+    matrix = np.empty((len(x), result.num_attributes))
+    for n in range(len(type_x)):
+        column = [row[n] for row in x]
+        if type_x[n] in ("C", "B", "S"):
+            _encode_column(result, n, column, type_x[n], matrix[:, n])
+        else:
+            # numpy turns None into nan, Weka's missing value
+            matrix[:, n] = np.array(column, dtype=np.float64)
+    if type_y != "":
+        if type_y in ("C", "B", "S"):
+            _encode_column(result, result.num_attributes - 1, y, type_y, matrix[:, -1])
+        else:
+            matrix[:, -1] = np.array(y, dtype=np.float64)
 
-        result.add_instance(Instance.create_instance(values))
+    add_rows(result, matrix)
 
     return result
 
@@ -1861,9 +2129,9 @@ def create_instances_from_matrices(x, y=None, name="data", cols_x=None, col_y=No
     nan values are interpreted as missing values.
 
     :param x: the input variables
-    :type x: np.ndarray
+    :type x: np.ndarray or list
     :param y: the output variable (optional)
-    :type y: np.ndarray
+    :type y: np.ndarray or list
     :param name: the name of the dataset
     :type name: str
     :param cols_x: the column names to use
@@ -1877,6 +2145,12 @@ def create_instances_from_matrices(x, y=None, name="data", cols_x=None, col_y=No
     :return: the generated dataset
     :rtype: Instances
     """
+    # the columns get accessed via numpy indexing, also accept lists
+    if not isinstance(x, np.ndarray):
+        x = np.asarray(x)
+    if (y is not None) and not isinstance(y, np.ndarray):
+        y = np.asarray(y)
+
     if y is not None:
         if len(x) != len(y):
             raise Exception("Dimensions of x and y differ: " + str(len(x)) + " != " + str(len(y)))
@@ -1898,42 +2172,41 @@ def create_instances_from_matrices(x, y=None, name="data", cols_x=None, col_y=No
     if nominal_x is not None:
         nominal_x_values = dict()
         for nominal_col in nominal_x:
-            labels = set()
-            for n in range(len(x)):
-                labels.add(typeconv.to_string(x[n][nominal_col]))
-            nominal_x_values[nominal_col] = sorted(list(labels))
+            if isinstance(x, np.ndarray) and (x.dtype.names is not None):
+                column = x[x.dtype.names[nominal_col]]
+            else:
+                column = x[:, nominal_col]
+            nominal_x_values[nominal_col] = _nominal_labels(column)
 
     # create header
     atts = []
     type_x = []
-    for i in range(len(x[0])):
-        try:
-            if (nominal_x_values is not None) and (i in nominal_x_values):
-                type_x.append("C")  # nominal
-                atts.append(Attribute.create_nominal(cols_x[i], nominal_x_values[i]))
-                continue
-            len(x.dtype)
-            if np.issubdtype(x.dtype[i], np.number):
-                type_x.append("N")  # number
-                atts.append(Attribute.create_numeric(cols_x[i]))
-            elif np.issubdtype(x.dtype[i], np.str_):
-                type_x.append("S")  # string
-                atts.append(Attribute.create_string(cols_x[i]))
-            else:
-                type_x.append("B")  # bytes
-                atts.append(Attribute.create_string(cols_x[i]))
-        except:
+    plain_x = (nominal_x_values is None) and isinstance(x, np.ndarray) and (x.ndim == 2) \
+        and (x.dtype == np.float64) and x.flags.c_contiguous
+    if plain_x:
+        # purely numeric matrix, no need to inspect the columns
+        type_x = ["N"] * x.shape[1]
+        atts = [Attribute.create_numeric(col) for col in cols_x]
+    has_fields = isinstance(x, np.ndarray) and (x.dtype.names is not None)
+    for i in range(0 if plain_x else len(x[0])):
+        if (nominal_x_values is not None) and (i in nominal_x_values):
+            type_x.append("C")  # nominal
+            atts.append(Attribute.create_nominal(cols_x[i], nominal_x_values[i]))
+        elif not has_fields or np.issubdtype(x.dtype[i], np.number):
             type_x.append("N")  # number
             atts.append(Attribute.create_numeric(cols_x[i]))
+        elif np.issubdtype(x.dtype[i], np.str_):
+            type_x.append("S")  # string
+            atts.append(Attribute.create_string(cols_x[i]))
+        else:
+            type_x.append("B")  # bytes
+            atts.append(Attribute.create_string(cols_x[i]))
     type_y = ""
     if y is not None:
         # nominal y column?
         nominal_y_values = None
         if nominal_y:
-            labels = set()
-            for n in range(len(y)):
-                labels.add(typeconv.to_string(y[n]))
-            nominal_y_values = sorted(list(labels))
+            nominal_y_values = _nominal_labels(y)
 
         if nominal_y:
             type_y = "C"
@@ -1951,38 +2224,58 @@ def create_instances_from_matrices(x, y=None, name="data", cols_x=None, col_y=No
     result = Instances.create_instances(name, atts, len(x))
 
     # add data
-    for i in range(len(x)):
-        values = []
-
-        for n in range(len(x[i])):
-            if isinstance(x[i][n], float) and np.isnan(x[i][n]):
-                values.append(missing_value())
-            elif type_x[n] == "N":
-                values.append(x[i][n])
-            elif type_x[n] == "S":
-                values.append(result.attribute(n).add_string_value(x[i][n]))
-            elif type_x[n] == "C":
-                values.append(result.attribute(n).index_of(typeconv.to_string(x[i][n])))
-            else:
-                values.append(result.attribute(n).add_string_value(typeconv.to_string(x[i][n])))
-
-        if y is not None:
-            if isinstance(y[i], float) and np.isnan(y[i]):
-                values.append(missing_value())
-            elif type_y == "N":
-                values.append(y[i])
-            elif type_y == "S":
-                values.append(result.attribute(result.num_attributes - 1).add_string_value(y[i]))
-            elif type_y == "C":
-                values.append(result.attribute(result.num_attributes - 1).index_of(typeconv.to_string(y[i])))
-            else:
-                values.append(result.attribute(result.num_attributes - 1).add_string_value(typeconv.to_string(y[i])))
-
-        result.add_instance(Instance.create_instance(values))
+    matrix = np.empty((len(x), result.num_attributes))
+    index_y = result.num_attributes - 1
+
+    # numeric columns can be copied as a whole (nan is Weka's missing value)
+    numeric_x = [n for n in range(len(type_x)) if type_x[n] == "N"]
+    other_x = [n for n in range(len(type_x)) if type_x[n] != "N"]
+    if plain_x:
+        matrix[:, :x.shape[1]] = x
+    elif not has_fields:
+        if len(numeric_x) > 0:
+            matrix[:, numeric_x] = x[:, numeric_x]
+    else:
+        for n in numeric_x:
+            matrix[:, n] = x[x.dtype.names[n]]
+    if type_y == "N":
+        matrix[:, -1] = y
+
+    # remaining columns are encoded one column at a time
+    for n in other_x:
+        column = x[x.dtype.names[n]] if has_fields else x[:, n]
+        _encode_column(result, n, column, type_x[n], matrix[:, n])
+    if (y is not None) and (type_y != "N"):
+        _encode_column(result, index_y, y, type_y, matrix[:, -1])
+
+    add_rows(result, matrix)
 
     return result
 
 
+def add_rows(data, matrix, classname="weka.core.DenseInstance", weight=1.0):
+    """
+    Appends the rows of the 2-dimensional matrix (internal format) to the dataset.
+    The matrix gets transferred to Java in a single bulk conversion rather than value by value
+    and the generated instances get added to the dataset in a single call.
+
+    :param data: the dataset to add the rows to
+    :type data: Instances
+    :param matrix: the values (internal format) to add, one row per instance, nan for missing values
+    :type matrix: np.ndarray
+    :param classname: the classname of the instances to create (eg weka.core.DenseInstance).
+    :type classname: str
+    :param weight: the weight of the instances
+    :type weight: float
+    """
+    if len(matrix) == 0:
+        return
+    rows = JArray.of(np.ascontiguousarray(matrix, dtype=np.float64), JDouble)
+    cls = JClass(classname)
+    insts = JArray(JClass("weka.core.Instance"))([cls(weight, row) for row in rows])
+    data.jobject.addAll(JClass("java.util.Arrays").asList(insts))
+
+
 def missing_value():
     """
     Returns the value that represents missing values in Weka (NaN).
@@ -1990,4 +2283,4 @@ def missing_value():
     :return: missing value
     :rtype: float
     """
-    return float("NaN")
+    return _MISSING
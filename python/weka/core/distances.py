@@ -14,8 +14,17 @@
 # distances.py
 # Copyright (C) 2021-2024 Fracpete (pythonwekawrapper at gmail dot com)
 
+import numpy as np
+from jpype import JClass
 from weka.core.classes import OptionHandler
-from weka.core.dataset import Instances, Instance
+from weka.core.dataset import Instances, Instance, NUMERIC, NOMINAL
+
+# the Weka distance functions that pairwise can compute with numpy
+NUMPY_METRICS = {
+    "weka.core.EuclideanDistance": "euclidean",
+    "weka.core.ManhattanDistance": "manhattan",
+    "weka.core.ChebyshevDistance": "chebyshev",
+}
 
 
 class DistanceFunction(OptionHandler):
@@ -108,3 +117,139 @@ class DistanceFunction(OptionHandler):
             return self._distance(first.jobject, second.jobject)
         else:
             return self._distance(first.jobject, second.jobject, cutoff)
+
+    def distance_with_cutoff(self, first, second, cutoff):
+        """
+        Computes the distance between the two Instance objects, using the cutoff value to speed up
+        the calculation. Avoids the check for a cutoff in hot loops (eg nearest neighbor searches).
+
+        :param first: the first instance
+        :type first: Instance
+        :param second: the second instance
+        :type second: Instance
+        :param cutoff: the cutoff value
+        :type cutoff: float
+        :return: the calculated distance
+        :rtype: float
+        """
+        return self._distance(first.jobject, second.jobject, cutoff)
+
+    def _numpy_matrix(self, instances):
+        """
+        Returns the (normalized) values of the attributes that the distance function uses, if the
+        distances can be computed with numpy: the distance function is listed in NUMPY_METRICS, it has
+        been initialized with a dataset and the attributes in use are numeric without missing values.
+        Other attribute types (eg date) get ignored, just like Weka does.
+
+        :param instances: the dataset to compute the distances for
+        :type instances: Instances
+        :return: the matrix, None if not applicable
+        :rtype: np.ndarray
+        """
+        if self.classname not in NUMPY_METRICS:
+            return None
+        data = self.jobject.getInstances()
+        if data is None:
+            return None
+        num_attributes = instances.num_attributes
+        if data.numAttributes() != num_attributes:
+            return None
+
+        # attributes in use, the class attribute gets always ignored
+        indices = JClass("weka.core.Range")(self.attribute_indices)
+        indices.setInvert(self.jobject.getInvertSelection())
+        indices.setUpper(num_attributes - 1)
+        active = []
+        for i in range(num_attributes):
+            if (i == data.classIndex()) or not indices.isInRange(i):
+                continue
+            # like weka.core.NormalizableDistance, only numeric and nominal attributes contribute
+            typ = instances.attribute(i).type
+            if typ == NOMINAL:
+                return None
+            if typ == NUMERIC:
+                active.append(i)
+
+        result = instances.to_numpy(internal=True)[:, active]
+        if np.isnan(result).any():
+            return None
+
+        # same normalization as weka.core.NormalizableDistance
+        if not self.jobject.getDontNormalize():
+            ranges = np.array(self.jobject.getRanges(), dtype=np.float64)[active]
+            constant = np.isnan(ranges[:, 0]) | (ranges[:, 0] == ranges[:, 1])
+            width = np.where(constant, 1.0, ranges[:, 2])
+            result = np.where(constant, 0.0, (result - ranges[:, 0]) / width)
+
+        return result
+
+    def pairwise(self, instances, cutoff=None, dtype=np.float64):
+        """
+        Computes the distances between all pairs of rows of the dataset. The rows get retrieved from
+        Java in a single call and, as distances are symmetric, only the upper triangle (incl. the
+        diagonal) gets computed. The distance function must have been initialized with a dataset
+        beforehand (see instances property). Without cutoff, the distance functions listed in
+        NUMPY_METRICS get computed with numpy if the attributes in use are all numeric and have no
+        missing values. The distances always get computed in float64 and then stored in a matrix of
+        type dtype, i.e., a reduced precision (eg np.float32) halves the memory of the matrix, which
+        is usually sufficient for ranking neighbors.
+
+        :param instances: the dataset to compute the distances for
+        :type instances: Instances
+        :param cutoff: optional cutoff value to speed up calculation
+        :type cutoff: float
+        :param dtype: the floating point type to store the distances with
+        :type dtype: type
+        :return: the square matrix of distances (num_instances x num_instances)
+        :rtype: np.ndarray
+        """
+        if cutoff is None:
+            matrix = self._numpy_matrix(instances)
+            if matrix is not None:
+                return _numpy_distances(matrix, NUMPY_METRICS[self.classname], dtype)
+
+        rows = list(instances.jobject.toArray())
+        num_rows = len(rows)
+        result = np.zeros((num_rows, num_rows), dtype=dtype)
+        if cutoff is None:
+            distance = self._distance
+        else:
+            def distance(first, second):
+                return self._distance(first, second, cutoff)
+        # the diagonal gets computed as well, as missing values result in a non-zero distance
+        for i in range(num_rows):
+            first = rows[i]
+            for n in range(i, num_rows):
+                value = distance(first, rows[n])
+                result[i, n] = value
+                result[n, i] = value
+        return result
+
+
+def _numpy_distances(matrix, metric, dtype=np.float64):
+    """
+    Computes the distances between all pairs of rows of the matrix. Each row of distances gets
+    computed in float64 and then stored in the result matrix of the specified type.
+
+    :param matrix: the (normalized) values to compute the distances for
+    :type matrix: np.ndarray
+    :param metric: the metric to use (euclidean, manhattan, chebyshev)
+    :type metric: str
+    :param dtype: the floating point type to store the distances with
+    :type dtype: type
+    :return: the square matrix of distances
+    :rtype: np.ndarray
+    """
+    num_rows = len(matrix)
+    result = np.zeros((num_rows, num_rows), dtype=dtype)
+    if matrix.shape[1] == 0:
+        return result
+    for i in range(num_rows):
+        diff = np.abs(matrix - matrix[i])
+        if metric == "euclidean":
+            result[i] = np.sqrt(np.einsum("ij,ij->i", diff, diff))
+        elif metric == "manhattan":
+            result[i] = diff.sum(axis=1)
+        else:
+            result[i] = diff.max(axis=1)
+    return result
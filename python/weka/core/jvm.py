@@ -35,6 +35,9 @@ logging.basicConfig()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+_lib_dir = os.path.join(os.path.split(os.path.dirname(__file__))[0], "lib")
+""" the directory with the bundled jars """
+
 
 def lib_dir():
     """
@@ -43,9 +46,7 @@ def lib_dir():
     :return: the path to the "lib" directory
     :rtype: str
     """
-
-    rootdir = os.path.split(os.path.dirname(__file__))[0]
-    return rootdir + os.sep + "lib"
+    return _lib_dir
 
 
 def add_bundled_jars(cp):
@@ -59,9 +60,7 @@ def add_bundled_jars(cp):
     libdir = lib_dir()
 
     # add jars from lib directory
-    for l in glob.glob(libdir + os.sep + "*.jar"):
-        if l.lower().find("-src.") == -1:
-            cp.append(str(l))
+    cp.extend([str(l) for l in glob.iglob(os.path.join(libdir, "*.jar")) if "-src." not in l.lower()])
 
 
 def add_system_classpath(cp):
@@ -71,12 +70,11 @@ def add_system_classpath(cp):
     :param cp: the list to append the classpath to
     :type cp: list
     """
-    if 'CLASSPATH' in os.environ:
-        parts = os.environ['CLASSPATH'].split(os.pathsep)
-        for part in parts:
-            cp.append(part)
-    else:
+    system_cp = os.environ.get('CLASSPATH', '')
+    if len(system_cp) == 0:
         logger.warning("Cannot add system's classpath, as environment variable CLASSPATH not set.")
+        return
+    cp.extend(system_cp.split(os.pathsep))
 
 
 def start(class_path=None, bundled=True, packages=False, system_cp=False, max_heap_size=None, system_info=False,
@@ -117,7 +115,7 @@ def start(class_path=None, bundled=True, packages=False, system_cp=False, max_he
     # add user-defined jars first
     if class_path is not None:
         for cp in class_path:
-            logger.debug("Adding user-supplied classpath=" + cp)
+            logger.debug("Adding user-supplied classpath=%s", cp)
             full_cp.append(cp)
 
     if bundled:
@@ -128,13 +126,13 @@ def start(class_path=None, bundled=True, packages=False, system_cp=False, max_he
         logger.debug("Adding system classpath")
         add_system_classpath(full_cp)
 
-    logger.debug("Classpath=" + str(full_cp))
+    logger.debug("Classpath=%s", full_cp)
 
     args = []
 
     # heap size
     if max_heap_size is not None:
-        logger.debug("MaxHeapSize=%s" % max_heap_size)
+        logger.debug("MaxHeapSize=%s", max_heap_size)
         args.append("-Xmx%s" % max_heap_size)
     else:
         logger.debug("MaxHeapSize=default")
@@ -150,11 +148,11 @@ def start(class_path=None, bundled=True, packages=False, system_cp=False, max_he
                 args.append("-Dweka.packageManager.loadPackages=false")
         if isinstance(packages, str):
             if os.path.exists(packages) and os.path.isdir(packages):
-                logger.debug("Using alternative Weka home directory: " + packages)
+                logger.debug("Using alternative Weka home directory: %s", packages)
                 weka_home = packages
                 with_package_support = True
             else:
-                logger.warning("Invalid Weka home: " + packages)
+                logger.warning("Invalid Weka home: %s", packages)
 
     if with_package_support and auto_install:
         logger.debug("Automatically installing missing Weka packages (based on suggestions).")
@@ -169,7 +167,7 @@ def start(class_path=None, bundled=True, packages=False, system_cp=False, max_he
     if weka_home is not None:
         from weka.core.classes import Environment
         env = Environment.system_wide()
-        logger.debug("Using alternative Weka home directory: " + packages)
+        logger.debug("Using alternative Weka home directory: %s", packages)
         env.add_variable("WEKA_HOME", weka_home)
 
     # initialize package manager
@@ -180,7 +178,7 @@ def start(class_path=None, bundled=True, packages=False, system_cp=False, max_he
         logger.debug("System info:")
         info = JClass("weka.core.SystemInfo")().getSystemInfo()
         for k in info.keys():
-            logger.debug(k + "=" + info[k])
+            logger.debug("%s=%s", k, info[k])
 
 
 def stop():
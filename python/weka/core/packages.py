@@ -20,7 +20,7 @@ import logging
 import sys
 import traceback
 from datetime import datetime
-from jpype import JClass
+from jpype import JClass, JArray
 import weka.core.jvm as jvm
 from weka.core.classes import JavaObject
 import weka.core.classes as classes
@@ -34,21 +34,29 @@ LATEST = "Latest"
 logger = logging.getLogger("weka.packages")
 logger.setLevel(logging.INFO)
 
+# whether the package cache has been established already
+_cache_established = False
+_no_output_streams = None
+
 
 class Package(JavaObject):
     """
     Wrapper for the weka.core.packageManagement.Package class.
     """
 
-    def __init__(self, jobject):
+    def __init__(self, jobject, trusted=False):
         """
         Initializes the wrapper.
 
         :param jobject: the java Package instance to wrap
         :type jobject: JPype object
+        :param trusted: whether the Java object is known to be of the correct type (skips the type check)
+        :type trusted: bool
         """
-        self.enforce_type(jobject, "weka.core.packageManagement.Package")
+        self.enforce_type(jobject, "weka.core.packageManagement.Package", trusted=trusted)
         super(Package, self).__init__(jobject)
+        self._name = None
+        self._url = None
         self._metadata = None
 
     @property
@@ -59,7 +67,9 @@ class Package(JavaObject):
         :return: the name
         :rtype: str
         """
-        return self.jobject.getName()
+        if self._name is None:
+            self._name = self.jobject.getName()
+        return self._name
 
     @property
     def version(self):
@@ -79,7 +89,9 @@ class Package(JavaObject):
         :return: the url
         :rtype: str
         """
-        return str(self.jobject.getPackageURL())
+        if self._url is None:
+            self._url = str(self.jobject.getPackageURL())
+        return self._url
 
     @property
     def dependencies(self):
@@ -89,10 +101,7 @@ class Package(JavaObject):
         :return: the list of Dependency objects
         :rtype: list of Dependency
         """
-        result = []
-        for dependency in self.jobject.getDependencies():
-            result.append(Dependency(dependency))
-        return result
+        return [Dependency(dependency, trusted=True) for dependency in self.jobject.getDependencies().toArray()]
 
     @property
     def metadata(self):
@@ -103,10 +112,8 @@ class Package(JavaObject):
         :rtype: dict
         """
         if self._metadata is None:
-            m = self.jobject.getPackageMetaData()
-            self._metadata = dict()
-            for k in m:
-                self._metadata[k] = m[k]
+            entries = self.jobject.getPackageMetaData().entrySet().toArray()
+            self._metadata = {entry.getKey(): entry.getValue() for entry in entries}
         return self._metadata
 
     @property
@@ -156,14 +163,16 @@ class PackageConstraint(JavaObject):
     Wrapper for the weka.core.packageManagement.PackageConstraint class.
     """
 
-    def __init__(self, jobject):
+    def __init__(self, jobject, trusted=False):
         """
         Initializes the wrapper.
 
         :param jobject: the java PackageConstraint instance to wrap
         :type jobject: JPype object
+        :param trusted: whether the Java object is known to be of the correct type (skips the type check)
+        :type trusted: bool
         """
-        self.enforce_type(jobject, "weka.core.packageManagement.PackageConstraint")
+        self.enforce_type(jobject, "weka.core.packageManagement.PackageConstraint", trusted=trusted)
         super(PackageConstraint, self).__init__(jobject)
 
     def set_package(self, pkge):
@@ -182,7 +191,7 @@ class PackageConstraint(JavaObject):
         :return: the package
         :rtype: Package
         """
-        return Package(self.jobject.getPackage())
+        return Package(self.jobject.getPackage(), trusted=True)
 
     def check_constraint(self, pkge=None, constr=None):
         """
@@ -205,14 +214,16 @@ class Dependency(JavaObject):
     Wrapper for the weka.core.packageManagement.Dependency class.
     """
 
-    def __init__(self, jobject):
+    def __init__(self, jobject, trusted=False):
         """
         Initializes the wrapper.
 
         :param jobject: the java Dependency instance to wrap
         :type jobject: JPype object
+        :param trusted: whether the Java object is known to be of the correct type (skips the type check)
+        :type trusted: bool
         """
-        self.enforce_type(jobject, "weka.core.packageManagement.Dependency")
+        self.enforce_type(jobject, "weka.core.packageManagement.Dependency", trusted=trusted)
         super(Dependency, self).__init__(jobject)
 
     @property
@@ -223,7 +234,7 @@ class Dependency(JavaObject):
         :return: the package
         :rtype: Package
         """
-        return Package(self.jobject.getSource())
+        return Package(self.jobject.getSource(), trusted=True)
 
     @source.setter
     def source(self, pkge):
@@ -243,7 +254,7 @@ class Dependency(JavaObject):
         :return: the package constraint
         :rtype: PackageConstraint
         """
-        return PackageConstraint(self.jobject.getTarget())
+        return PackageConstraint(self.jobject.getTarget(), trusted=True)
 
     @target.setter
     def target(self, constr):
@@ -256,11 +267,28 @@ class Dependency(JavaObject):
         self.jobject.setTarget(constr.jobject)
 
 
+def _no_output():
+    """
+    Returns the empty PrintStream array for the package manager methods, which only gets created once.
+
+    :return: the empty array
+    :rtype: JArray
+    """
+    global _no_output_streams
+    if _no_output_streams is None:
+        _no_output_streams = JArray(JClass("java.io.PrintStream"))(0)
+    return _no_output_streams
+
+
 def establish_cache():
     """
-    Establishes the package cache if necessary.
+    Establishes the package cache if necessary. Only checks once per session.
     """
+    global _cache_established
+    if _cache_established:
+        return
     JClass("weka.core.WekaPackageManager").establishCacheIfNeeded()
+    _cache_established = True
 
 
 def refresh_cache():
@@ -271,6 +299,23 @@ def refresh_cache():
     JClass("weka.core.WekaPackageManager").refreshCache()
 
 
+def _package_by_name(pkges, name):
+    """
+    Returns the package with the specified name, only wrapping the matching Java object.
+
+    :param pkges: the Java package objects to search
+    :type pkges: list
+    :param name: the name of the package to look for
+    :type name: str
+    :return: the package, None if not found
+    :rtype: Package
+    """
+    for pkge in pkges:
+        if pkge.getName() == name:
+            return Package(pkge, trusted=True)
+    return None
+
+
 def all_packages():
     """
     Returns a list of all packages.
@@ -279,10 +324,17 @@ def all_packages():
     :rtype: list
     """
     establish_cache()
-    result = []
-    for pkge in JClass("weka.core.WekaPackageManager").getAllPackages():
-        result.append(Package(pkge))
-    return result
+    return [Package(pkge, trusted=True) for pkge in JClass("weka.core.WekaPackageManager").getAllPackages().toArray()]
+
+
+def all_packages_map():
+    """
+    Returns all packages as dictionary, using the package name as key.
+
+    :return: the dictionary of packages (name -> Package)
+    :rtype: dict
+    """
+    return {pkge.name: pkge for pkge in all_packages()}
 
 
 def all_package(name):
@@ -294,11 +346,8 @@ def all_package(name):
     :return: the package information, None if not available
     :rtype: Package
     """
-    pkgs = all_packages()
-    for pkg in pkgs:
-        if pkg.name == name:
-            return pkg
-    return None
+    establish_cache()
+    return _package_by_name(JClass("weka.core.WekaPackageManager").getAllPackages().toArray(), name)
 
 
 def available_packages():
@@ -309,10 +358,7 @@ def available_packages():
     :rtype: list
     """
     establish_cache()
-    result = []
-    for pkge in JClass("weka.core.WekaPackageManager").getAvailablePackages():
-        result.append(Package(pkge))
-    return result
+    return [Package(pkge, trusted=True) for pkge in JClass("weka.core.WekaPackageManager").getAvailablePackages().toArray()]
 
 
 def available_package(name):
@@ -324,11 +370,8 @@ def available_package(name):
     :return: the package information
     :rtype: Package
     """
-    pkgs = available_packages()
-    for pkg in pkgs:
-        if pkg.name == name:
-            return pkg
-    return None
+    establish_cache()
+    return _package_by_name(JClass("weka.core.WekaPackageManager").getAvailablePackages().toArray(), name)
 
 
 def installed_packages():
@@ -339,10 +382,28 @@ def installed_packages():
     :rtype: list
     """
     establish_cache()
-    result = []
-    for pkge in JClass("weka.core.WekaPackageManager").getInstalledPackages():
-        result.append(Package(pkge))
-    return result
+    return [Package(pkge, trusted=True) for pkge in JClass("weka.core.WekaPackageManager").getInstalledPackages().toArray()]
+
+
+def installed_packages_map():
+    """
+    Returns the installed packages as dictionary, using the package name as key.
+
+    :return: the dictionary of packages (name -> Package)
+    :rtype: dict
+    """
+    return {pkge.name: pkge for pkge in installed_packages()}
+
+
+def installed_package_names():
+    """
+    Returns the names of the installed packages, without wrapping the packages.
+
+    :return: the list of package names
+    :rtype: list
+    """
+    establish_cache()
+    return [pkge.getName() for pkge in JClass("weka.core.WekaPackageManager").getInstalledPackages().toArray()]
 
 
 def installed_package(name):
@@ -354,11 +415,11 @@ def installed_package(name):
     :return: the package information
     :rtype: Package
     """
-    pkgs = installed_packages()
-    for pkg in pkgs:
-        if pkg.name == name:
-            return pkg
-    return None
+    establish_cache()
+    pkge = JClass("weka.core.WekaPackageManager").getInstalledPackageInfo(name)
+    if pkge is None:
+        return None
+    return Package(pkge, trusted=True)
 
 
 def install_package(pkge, version=LATEST, details=False):
@@ -407,6 +468,9 @@ def install_packages(pkges, fail_fast=True, details=False):
     result = True
     result_details = dict()
     establish_cache()
+    manager = JClass("weka.core.WekaPackageManager")
+    url_class = JClass("java.net.URL")
+    no_output = _no_output()
     for p in pkges:
         # get name/version
         if isinstance(p, tuple):
@@ -419,21 +483,20 @@ def install_packages(pkges, fail_fast=True, details=False):
         install_msg = None
         from_repo = False
         success = True
-        if pkge.startswith("http://") or pkge.startswith("https://"):
+        if pkge.startswith(("http://", "https://")):
             try:
-                url = JClass("java.net.URL")(pkge)
-                install_msg = JClass("weka.core.WekaPackageManager").installPackageFromURL(url)
+                install_msg = manager.installPackageFromURL(url_class(pkge), no_output)
             except:
                 msg = traceback.format_exc()
         elif pkge.lower().endswith(".zip"):
             try:
-                install_msg = JClass("weka.core.WekaPackageManager").installPackageFromArchive(pkge)
+                install_msg = manager.installPackageFromArchive(pkge, no_output)
             except:
                 msg = traceback.format_exc()
         else:
             from_repo = True
             try:
-                JClass("weka.core.WekaPackageManager").installPackageFromRepository(pkge, version)
+                manager.installPackageFromRepository(pkge, version, no_output)
             except:
                 msg = traceback.format_exc()
 
@@ -501,6 +564,7 @@ def install_missing_packages(pkges, quiet=False, stop_jvm_and_exit=False):
     """
     result = True
     exit_required = False
+    all_pkgs = None
     for p in pkges:
         # get name/version
         if isinstance(p, tuple):
@@ -522,7 +586,10 @@ def install_missing_packages(pkges, quiet=False, stop_jvm_and_exit=False):
                 logger.error("Failed to install %s/%s" % (pkge, version))
         else:
             inst = installed_package(pkge)
-            all_pkg = all_package(pkge)
+            # index all packages only once
+            if all_pkgs is None:
+                all_pkgs = all_packages_map()
+            all_pkg = all_pkgs.get(pkge)
             install_required = False
             if (version == LATEST) and (all_pkg.version != inst.version):
                 install_required = True
@@ -576,8 +643,10 @@ def uninstall_packages(names):
     :type names: list
     """
     establish_cache()
+    manager = JClass("weka.core.WekaPackageManager")
+    no_output = _no_output()
     for name in names:
-        JClass("weka.core.WekaPackageManager").uninstallPackage(name, True)
+        manager.uninstallPackage(name, True, no_output)
 
 
 def is_installed(name, version=None):
@@ -591,15 +660,13 @@ def is_installed(name, version=None):
     :return: whether the package is installed
     :rtype: bool
     """
-    pkgs = installed_packages()
-    for pkge in pkgs:
-        if pkge.name == name:
-            if version is not None:
-                if pkge.version == version:
-                    return True
-            else:
-                return True
-    return False
+    establish_cache()
+    pkge = JClass("weka.core.WekaPackageManager").getInstalledPackageInfo(name)
+    if pkge is None:
+        return False
+    if version is None:
+        return True
+    return Package(pkge, trusted=True).version == version
 
 
 def is_official_package(name, version=None):
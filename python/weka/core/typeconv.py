@@ -99,32 +99,32 @@ def jdouble_matrix_to_ndarray(m):
 
 def jdouble_array_to_ndarray(a):
     """
-    Turns the Java array of doubles into a numpy 2-dim array.
+    Turns the Java array of doubles into a numpy 1-dim array.
+    The array gets copied in a single bulk operation.
 
     :param a: the double array
     :type: JPype object
-    :return: Numpy array
+    :return: Numpy array, None if the array is None
     :rtype: numpy.darray
     """
-    result = numpy.zeros(len(a))
-    for i in range(len(a)):
-        result[i] = a[i]
-    return result
+    if a is None:
+        return None
+    return numpy.array(a, dtype=numpy.float64)
 
 
 def jint_array_to_ndarray(a):
     """
-    Turns the Java array of ints into a numpy 2-dim array.
+    Turns the Java array of ints into a numpy 1-dim array.
+    The array gets copied in a single bulk operation.
 
-    :param a: the double array
+    :param a: the int array
     :type: JPype object
-    :return: Numpy array
+    :return: Numpy array, None if the array is None
     :rtype: numpy.darray
     """
-    result = numpy.zeros(len(a))
-    for i in range(len(a)):
-        result[i] = a[i]
-    return result
+    if a is None:
+        return None
+    return numpy.array(a, dtype=numpy.float64)
 
 
 def jenumeration_to_list(enm):
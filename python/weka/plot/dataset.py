@@ -57,18 +57,12 @@ def scatter_plot(data, index_x, index_y, percent=100.0, seed=1, size=50, title=N
     data = plot.create_subsample(data, percent=percent, seed=seed)
 
     # collect data
-    x = []
-    y = []
+    x = data.values(index_x)
+    y = data.values(index_y)
     if data.class_index == -1:
         c = None
     else:
-        c = []
-    for i in range(data.num_instances):
-        inst = data.get_instance(i)
-        x.append(inst.get_value(index_x))
-        y.append(inst.get_value(index_y))
-        if c is not None:
-            c.append(inst.get_value(inst.class_index))
+        c = data.values(data.class_index)
 
     # plot data
     fig, ax = plt.subplots()
@@ -126,21 +120,13 @@ def matrix_plot(data, percent=100.0, seed=1, size=10, title=None, outfile=None,
     if data.class_index == -1:
         c = None
     else:
-        c = []
-        for i in range(data.num_instances):
-            inst = data.get_instance(i)
-            c.append(inst.get_value(inst.class_index))
+        c = data.values(data.class_index)
 
+    columns = [data.values(index) for index in range(data.num_attributes)]
     for index_x in range(data.num_attributes):
-        x = []
-        for i in range(data.num_instances):
-            inst = data.get_instance(i)
-            x.append(inst.get_value(index_x))
+        x = columns[index_x]
         for index_y in range(data.num_attributes):
-            y = []
-            for i in range(data.num_instances):
-                inst = data.get_instance(i)
-                y.append(inst.get_value(index_y))
+            y = columns[index_y]
             ax = fig.add_subplot(
                 data.num_attributes, data.num_attributes, index_x * data.num_attributes + index_y + 1)
             if c is None:
@@ -205,9 +191,8 @@ def line_plot(data, atts=None, percent=100.0, seed=1, title=None, outfile=None,
     ax.set_ylabel("value")
     ax.grid(True)
     for index_y in range(data.num_instances):
-        y = []
-        for index_x in x:
-            y.append(data.get_instance(index_y).get_value(index_x))
+        values = data.get_instance(index_y).values
+        y = [values[index_x] for index_x in x]
         ax.plot(x, y, "o-", alpha=0.5)
     if title is None:
         title = data.relationname
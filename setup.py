@@ -59,7 +59,7 @@ setup(
     author='Peter "fracpete" Reutemann',
     author_email='pythonwekawrapper@gmail.com',
     install_requires=[
-        "jpype1",
+        "jpype1>=1.3.0",
         "numpy>=1.20.1",
         "packaging",
         "configurable_objects",
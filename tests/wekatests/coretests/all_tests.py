@@ -20,6 +20,7 @@ import wekatests.coretests.capabilities
 import wekatests.coretests.classes
 import wekatests.coretests.converters
 import wekatests.coretests.dataset
+import wekatests.coretests.distances
 import wekatests.coretests.serialization
 import wekatests.coretests.stemmers
 import wekatests.coretests.stopwords
@@ -45,6 +46,7 @@ def suite():
     result.addTests(wekatests.coretests.classes.suite())
     result.addTests(wekatests.coretests.converters.suite())
     result.addTests(wekatests.coretests.dataset.suite())
+    result.addTests(wekatests.coretests.distances.suite())
     result.addTests(wekatests.coretests.serialization.suite())
     result.addTests(wekatests.coretests.stemmers.suite())
     result.addTests(wekatests.coretests.stopwords.suite())
@@ -18,8 +18,9 @@ import unittest
 import weka.core.jvm as jvm
 import weka.core.dataset as dataset
 import weka.core.converters as converters
+from weka.core.classes import Random
 import wekatests.tests.weka_test as weka_test
-from weka.core.dataset import create_instances_from_lists, create_instances_from_matrices
+from weka.core.dataset import create_instances_from_lists, create_instances_from_matrices, check_col_names_unique
 from random import randint
 import numpy as np
 
@@ -35,18 +36,26 @@ class TestDataset(weka_test.WekaTest):
         self.assertIsNotNone(att, "Failed to create attribute!")
         self.assertEqual(name, att.name, "Names differ")
         self.assertTrue(att.is_numeric)
+        self.assertEqual(dataset.NUMERIC, att.type, "Types differ")
 
         name = "Nom"
         att = dataset.Attribute.create_nominal(name, ["A", "B", "C"])
         self.assertIsNotNone(att, "Failed to create attribute!")
         self.assertEqual(name, att.name, "Names differ")
         self.assertTrue(att.is_nominal)
+        self.assertFalse(att.is_numeric)
+        self.assertEqual(dataset.NOMINAL, att.type, "Types differ")
+        self.assertEqual(["A", "B", "C"], att.values, "Labels differ")
+        att.values.append("D")
+        self.assertEqual(["A", "B", "C"], att.values, "Labels differ")
 
         name = "Dat1"
         att = dataset.Attribute.create_date(name)
         self.assertIsNotNone(att, "Failed to create attribute!")
         self.assertEqual(name, att.name, "Names differ")
         self.assertTrue(att.is_date)
+        self.assertTrue(att.is_numeric)
+        self.assertEqual(dataset.DATE, att.type, "Types differ")
 
         name = "Dat2"
         att = dataset.Attribute.create_date(name, formt="yyyy-MM-dd HH:mm")
@@ -59,6 +68,11 @@ class TestDataset(weka_test.WekaTest):
         self.assertIsNotNone(att, "Failed to create attribute!")
         self.assertEqual(name, att.name, "Names differ")
         self.assertTrue(att.is_string)
+        self.assertEqual(dataset.STRING, att.type, "Types differ")
+
+        # untrusted objects still get checked
+        with self.assertRaises(TypeError):
+            dataset.Attribute(dataset.Instance.create_instance([1.0]).jobject)
 
     def test_attributestats(self):
         """
@@ -75,9 +89,15 @@ class TestDataset(weka_test.WekaTest):
         self.assertEqual(0, stats.missing_count, "missing_count differs")
         self.assertEqual([86, 256, 440, 0, 51, 20, 10, 19, 16], stats.nominal_counts.tolist(), "nominal_counts differs")
         self.assertEqual([86, 256, 440, 0, 51, 20, 10, 19, 16], stats.nominal_weights.tolist(), "nominal_weights differs")
+        self.assertEqual(np.int32, stats.nominal_counts.dtype, "nominal_counts dtype differs")
         self.assertEqual(898, stats.total_count, "total_count differs")
         self.assertEqual(0, stats.unique_count, "unique_count differs")
 
+        # numeric attribute
+        stats = data.attribute_stats(3)
+        self.assertIsNone(stats.nominal_counts, "nominal_counts should be None")
+        self.assertIsNone(stats.nominal_weights, "nominal_weights should be None")
+
     def test_stats(self):
         """
         Tests the Stats class.
@@ -127,6 +147,13 @@ class TestDataset(weka_test.WekaTest):
         self.assertEqual("H", inst.get_string_value(1), msg="string value differs")
 
         self.assertEqual(8, inst.get_value(3), msg="numeric value differs")
+
+        row = inst.to_numpy(internal=True)
+        self.assertEqual((1, 39), row.shape, msg="shape differs")
+        self.assertEqual(str(inst.values.tolist()), str(row[0].tolist()), msg="values differ")
+        row = inst.to_numpy()
+        self.assertEqual("H", row[0][1], msg="string value differs")
+        self.assertEqual(8, row[0][3], msg="numeric value differs")
         inst.set_value(3, 6.3)
         self.assertEqual(6.3, inst.get_value(3), msg="numeric value differs")
 
@@ -134,6 +161,18 @@ class TestDataset(weka_test.WekaTest):
         inst.weight = 0.5
         self.assertEqual(0.5, inst.weight, msg="weights differ")
 
+        inst = data.get_instance(1)
+        values = [x for x in inst]
+        self.assertEqual(inst.num_attributes, len(values), msg="#values differ")
+        for i in range(inst.num_attributes):
+            if data.attribute(i).is_numeric:
+                if inst.is_missing(i):
+                    self.assertTrue(np.isnan(values[i]), msg="value at #" + str(i) + " should be missing")
+                else:
+                    self.assertEqual(inst.get_value(i), values[i], msg="value at #" + str(i) + " differs")
+            else:
+                self.assertEqual(inst.get_string_value(i), values[i], msg="value at #" + str(i) + " differs")
+
         values = [1.0, 2.0, 3.0]
         inst = dataset.Instance.create_instance(values, classname="weka.core.DenseInstance")
         self.assertEqual(3, inst.num_attributes, msg="#attributes differ")
@@ -155,6 +194,20 @@ class TestDataset(weka_test.WekaTest):
         self.assertEqual(2.0, inst.get_value(1), msg="value at #" + str(1) + " differs")
         self.assertEqual(0.0, inst.get_value(2), msg="value at #" + str(2) + " differs")
 
+        values = (np.array([0, 2]), np.array([1.5, 3.0]))
+        inst = dataset.Instance.create_sparse_instance(values, 3, classname="weka.core.SparseInstance")
+        self.assertEqual(3, inst.num_attributes, msg="#attributes differ")
+        self.assertEqual(1.5, inst.get_value(0), msg="value at #" + str(0) + " differs")
+        self.assertEqual(0.0, inst.get_value(1), msg="value at #" + str(1) + " differs")
+        self.assertEqual(3.0, inst.get_value(2), msg="value at #" + str(2) + " differs")
+
+        values = ((i, float(i + 1)) for i in [0, 2])
+        inst = dataset.Instance.create_sparse_instance(values, 3, classname="weka.core.SparseInstance")
+        self.assertEqual(3, inst.num_attributes, msg="#attributes differ")
+        self.assertEqual(1.0, inst.get_value(0), msg="value at #" + str(0) + " differs")
+        self.assertEqual(0.0, inst.get_value(1), msg="value at #" + str(1) + " differs")
+        self.assertEqual(3.0, inst.get_value(2), msg="value at #" + str(2) + " differs")
+
     def test_instances(self):
         """
         Tests the Instances class.
@@ -168,11 +221,56 @@ class TestDataset(weka_test.WekaTest):
         for i in data:
             count += 1
         self.assertEqual(898, count, msg="Number of rows differs!")
+        rows = list(data.fast_iter())
+        self.assertEqual(898, len(rows), msg="Number of rows differs!")
+        self.assertEqual(str(data.get_instance(1)), str(rows[1]), msg="Rows differ!")
 
         count = 0
         for i in data.attributes():
             count += 1
         self.assertEqual(39, count, msg="Number of attributes differs!")
+        names = data.attribute_names()
+        self.assertEqual(39, len(names), msg="Number of attribute names differs!")
+        self.assertEqual(data.attribute(0).name, names[0], msg="Attribute name differs!")
+
+        values = data.values(2)
+        self.assertEqual(898, len(values), msg="Number of values differs")
+        self.assertEqual([data.get_instance(i).get_value(2) for i in range(10)], values[0:10].tolist(), msg="values differ")
+
+        matrix = data.to_numpy()
+        self.assertEqual(898, len(matrix), msg="Number of rows differs")
+        self.assertEqual(data.get_instance(0).get_string_value(0), matrix[0][0], msg="nominal value differs")
+        self.assertEqual(data.get_instance(0).get_value(3), matrix[0][3], msg="numeric value differs")
+
+        subset = data[10:20]
+        self.assertEqual(10, subset.num_instances, msg="Number of rows differs")
+        self.assertEqual(str(data[10]), str(subset[0]), msg="Rows differ")
+        subset = data[5::100]
+        self.assertEqual(9, subset.num_instances, msg="Number of rows differs")
+        self.assertEqual(str(data[105]), str(subset[1]), msg="Rows differ")
+        self.assertEqual(0, data[20:10].num_instances, msg="Number of rows differs")
+
+        combined = dataset.Instances.append_instances(data[0:10], data[10:15])
+        self.assertEqual(15, combined.num_instances, msg="Number of rows differs")
+        self.assertEqual(str(data[12]), str(combined[12]), msg="Rows differ")
+
+        splits = data.cv_splits(folds=3, rnd=Random(1), stratify=False)
+        self.assertEqual(3, len(splits), msg="Number of splits differs")
+        for train, test in splits:
+            self.assertEqual(data.num_instances, train.num_instances + test.num_instances, msg="Split sizes differ")
+
+        subset = data.subset(col_range="1-3")
+        self.assertEqual(3, subset.num_attributes, msg="Number of attributes differs")
+        self.assertEqual(data.num_instances, subset.num_instances, msg="Number of rows differs")
+        subset = data.subset(row_range="1-5")
+        self.assertEqual(data.num_attributes, subset.num_attributes, msg="Number of attributes differs")
+        self.assertEqual(5, subset.num_instances, msg="Number of rows differs")
+        subset = data.subset(col_range="1-3", row_range="1-5")
+        self.assertEqual(3, subset.num_attributes, msg="Number of attributes differs")
+        self.assertEqual(5, subset.num_instances, msg="Number of rows differs")
+
+        # fewer rows than columns
+        self.assertEqual(str(data.to_numpy(internal=True)[0:5].tolist()), str(data[0:5].to_numpy(internal=True).tolist()), msg="Matrices differ")
 
         self.assertEqual(898, data.num_instances, msg="num_instances differs")
         self.assertEqual(39, data.num_attributes, msg="num_attributes differs")
@@ -213,6 +311,20 @@ class TestDataset(weka_test.WekaTest):
         data.no_class()
         self.assertFalse(data.has_class(), msg="Should not have class set!")
 
+        # missing values
+        data = loader.load_file(self.datafile("anneal.ORIG.arff"))
+        self.assertIsNotNone(data, msg="Failed to load data!")
+        expected = loader.load_file(self.datafile("anneal.ORIG.arff"))
+        expected.delete_with_missing(1)
+        expected.delete_with_missing(4)
+        data.delete_with_missing_any([1, 4])
+        self.assertEqual(expected.num_instances, data.num_instances, msg="num_instances differs (missing)")
+        self.assertEqual(str(expected), str(data), msg="content differs (missing)")
+        data.delete_with_missing_all()
+        for i in range(data.num_attributes):
+            expected.delete_with_missing(i)
+        self.assertEqual(expected.num_instances, data.num_instances, msg="num_instances differs (missing all)")
+
         # changing rows
         data1 = loader.load_file(self.datafile("anneal.arff"))
         self.assertIsNotNone(data1, msg="Failed to load data!")
@@ -335,6 +447,9 @@ class TestDataset(weka_test.WekaTest):
         self.assertEqual(len(dataset), 10)
         dataset = create_instances_from_lists(x, y, name="generated from lists")
         self.assertEqual(len(dataset), 10)
+        self.assertEqual(6, dataset.num_attributes)
+        self.assertEqual("y", dataset.attribute(5).name)
+        self.assertEqual([row + [y[i]] for i, row in enumerate(x)], dataset.to_numpy(internal=True).tolist())
 
         # mixed
         x = [["TEXT", 1, 1.1], ["XXX", 2, 2.2]]
@@ -360,6 +475,23 @@ class TestDataset(weka_test.WekaTest):
         self.assertEqual(len(dataset), 10)
         self.assertTrue(dataset.get_instance(0).is_missing(1))
         self.assertTrue(dataset.get_instance(2).is_missing(dataset.num_attributes - 1))
+        x = [["TEXT", 1], [float("nan"), 2]]
+        y = ["A", float("nan")]
+        dataset = create_instances_from_lists(x, y, name="generated from mixed lists with nan")
+        self.assertTrue(dataset.get_instance(1).is_missing(0))
+        self.assertTrue(dataset.get_instance(1).is_missing(2))
+        self.assertEqual(["TEXT"], dataset.attribute(0).values)
+        x = [["a"], [float("nan")], ["b"], [None]]
+        dataset = create_instances_from_lists(x, name="generated from nominal lists with nan/None", nominal_x=[0])
+        self.assertEqual(["a", "b"], dataset.attribute(0).values)
+        self.assertTrue(dataset.get_instance(1).is_missing(0))
+        self.assertTrue(dataset.get_instance(3).is_missing(0))
+        self.assertEqual("b", dataset.get_instance(2).get_string_value(0))
+
+        # column names
+        self.assertIsNone(check_col_names_unique(["a", "b"], col_y="c"))
+        self.assertEqual("Input variable name at #2 is already present: a", check_col_names_unique(["a", "b", "a"]))
+        self.assertEqual("Output variable name is already present: b", check_col_names_unique(["a", "b"], col_y="b"))
 
     def test_create_instances_from_matrices(self):
         """
@@ -375,6 +507,17 @@ class TestDataset(weka_test.WekaTest):
         self.assertEqual(len(dataset), 10)
         dataset = create_instances_from_lists(x, y, name="generated from matrices")
         self.assertEqual(len(dataset), 10)
+        dataset = create_instances_from_matrices(x, y, name="generated from numeric matrices")
+        self.assertEqual(len(dataset), 10)
+        self.assertEqual(6, dataset.num_attributes)
+        self.assertTrue(dataset.attribute(0).is_numeric)
+        self.assertTrue(np.allclose(x, dataset.to_numpy(internal=True)[:, 0:5]))
+        row = dataset.get_instance(0).to_numpy()
+        self.assertEqual(6, len(row.dtype.names))
+        self.assertTrue(np.allclose(x[0], list(row[0])[0:5]))
+        dataset = create_instances_from_matrices([[1.0, 2.0], [3.0, 4.0]], [5.0, 6.0], name="generated from plain lists")
+        self.assertEqual(2, len(dataset))
+        self.assertEqual([[1.0, 2.0, 5.0], [3.0, 4.0, 6.0]], dataset.to_numpy(internal=True).tolist())
 
         # mixed
         x = np.array([("TEXT", 1, 1.1), ("XXX", 2, 2.2)], dtype='S20, i4, f8')
@@ -398,6 +541,13 @@ class TestDataset(weka_test.WekaTest):
         self.assertEqual(len(dataset), 2)
         self.assertTrue(dataset.get_instance(1).is_missing(2))
         self.assertTrue(dataset.get_instance(1).is_missing(dataset.num_attributes - 1))
+        x = np.array([[1.0], [np.nan], [2.0]])
+        y = np.array(["A", None, "B"], dtype=object)
+        dataset = create_instances_from_matrices(x, y, name="generated from nominal matrices with nan/None", nominal_x=[0], nominal_y=True)
+        self.assertEqual(["1.0", "2.0"], dataset.attribute(0).values)
+        self.assertEqual(["A", "B"], dataset.attribute(1).values)
+        self.assertTrue(dataset.get_instance(1).is_missing(0))
+        self.assertTrue(dataset.get_instance(1).is_missing(1))
 
 
 def suite():
@@ -0,0 +1,173 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# distances.py
+# Copyright (C) 2024 Fracpete (pythonwekawrapper at gmail dot com)
+
+import unittest
+import numpy as np
+import weka.core.jvm as jvm
+import weka.core.converters as converters
+from weka.core.dataset import Instances
+from weka.core.distances import DistanceFunction
+import wekatests.tests.weka_test as weka_test
+
+
+class TestDistances(weka_test.WekaTest):
+
+    def load(self, fname, num_rows=30):
+        """
+        Loads the first rows of the dataset, with the class attribute set to the last one.
+
+        :param fname: the file to load (without path)
+        :type fname: str
+        :param num_rows: the number of rows to keep
+        :type num_rows: int
+        :return: the dataset
+        :rtype: Instances
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile(fname))
+        self.assertIsNotNone(data, msg="Failed to load data!")
+        data.class_is_last()
+        return Instances.copy_instances(data, 0, num_rows)
+
+    def check_matrix(self, dist, data, matrix, places=7, zero_diagonal=True):
+        """
+        Checks that the distance matrix is square, symmetric, has a zero diagonal (unless there are
+        missing values) and agrees with the distances computed for the individual pairs.
+
+        :param dist: the distance function used to compute the matrix
+        :type dist: DistanceFunction
+        :param data: the dataset the matrix was computed for
+        :type data: Instances
+        :param matrix: the distance matrix
+        :type matrix: np.ndarray
+        :param places: the number of decimal places to compare
+        :type places: int
+        :param zero_diagonal: whether to check for a zero diagonal
+        :type zero_diagonal: bool
+        """
+        self.assertEqual((data.num_instances, data.num_instances), matrix.shape, msg="shape differs")
+        np.testing.assert_array_equal(matrix, matrix.T, err_msg="not symmetric")
+        if zero_diagonal:
+            np.testing.assert_array_equal(np.zeros(data.num_instances), np.diag(matrix), err_msg="diagonal not zero")
+        for i in range(data.num_instances):
+            for n in range(data.num_instances):
+                self.assertAlmostEqual(
+                    dist.distance(data.get_instance(i), data.get_instance(n)), matrix[i, n], places=places,
+                    msg="distance differs for rows " + str(i) + "/" + str(n))
+
+    def test_pairwise_numpy(self):
+        """
+        Tests the pairwise method using numpy.
+        """
+        data = self.load("iris.arff")
+        for classname in ["weka.core.EuclideanDistance", "weka.core.ManhattanDistance", "weka.core.ChebyshevDistance"]:
+            dist = DistanceFunction(classname=classname)
+            dist.instances = data
+            self.assertIsNotNone(dist._numpy_matrix(data), msg="numpy should get used: " + classname)
+            self.check_matrix(dist, data, dist.pairwise(data))
+
+    def test_pairwise_date(self):
+        """
+        Tests the pairwise method with a date attribute, which Weka ignores.
+        """
+        data = self.load("airline.arff")
+        data.no_class()
+        dist = DistanceFunction(classname="weka.core.EuclideanDistance")
+        dist.instances = data
+        self.assertIsNotNone(dist._numpy_matrix(data), msg="numpy should get used")
+        self.assertEqual(1, dist._numpy_matrix(data).shape[1], msg="date attribute should get ignored")
+        self.check_matrix(dist, data, dist.pairwise(data))
+
+    def test_pairwise_java(self):
+        """
+        Tests the pairwise method falling back on Java.
+        """
+        # nominal attributes
+        data = self.load("anneal.arff")
+        dist = DistanceFunction(classname="weka.core.EuclideanDistance")
+        dist.instances = data
+        self.assertIsNone(dist._numpy_matrix(data), msg="numpy should not get used (nominal)")
+        self.check_matrix(dist, data, dist.pairwise(data))
+
+        # missing values
+        data = self.load("anneal.ORIG.arff")
+        dist = DistanceFunction(classname="weka.core.EuclideanDistance")
+        dist.instances = data
+        self.assertIsNone(dist._numpy_matrix(data), msg="numpy should not get used (missing)")
+        self.check_matrix(dist, data, dist.pairwise(data), zero_diagonal=False)
+
+        # not supported by numpy
+        data = self.load("iris.arff")
+        dist = DistanceFunction(classname="weka.core.MinkowskiDistance")
+        dist.instances = data
+        self.assertIsNone(dist._numpy_matrix(data), msg="numpy should not get used (Minkowski)")
+        self.check_matrix(dist, data, dist.pairwise(data))
+
+    def test_cutoff(self):
+        """
+        Tests the distance_with_cutoff method and the pairwise method with a cutoff.
+        """
+        data = self.load("iris.arff")
+        dist = DistanceFunction(classname="weka.core.EuclideanDistance")
+        dist.instances = data
+        full = dist.pairwise(data, cutoff=float("inf"))
+        cutoff = float(np.median(full))
+
+        # single pairs
+        first = data.get_instance(0)
+        for i in range(data.num_instances):
+            second = data.get_instance(i)
+            value = dist.distance_with_cutoff(first, second, cutoff)
+            if full[0, i] > cutoff:
+                self.assertEqual(float("inf"), value, msg="should be infinite for row " + str(i))
+            else:
+                self.assertEqual(full[0, i], value, msg="should be unchanged for row " + str(i))
+
+        # all pairs
+        matrix = dist.pairwise(data, cutoff=cutoff)
+        above = full > cutoff
+        self.assertTrue(above.any(), msg="some distances should be above the cutoff")
+        self.assertTrue((~above).any(), msg="some distances should be below the cutoff")
+        self.assertTrue(np.isinf(matrix[above]).all(), msg="distances above the cutoff should be infinite")
+        np.testing.assert_array_equal(full[~above], matrix[~above], err_msg="distances below the cutoff differ")
+
+    def test_dtype(self):
+        """
+        Tests the pairwise method with reduced precision.
+        """
+        for fname in ["iris.arff", "anneal.arff"]:
+            data = self.load(fname)
+            dist = DistanceFunction(classname="weka.core.EuclideanDistance")
+            dist.instances = data
+            expected = dist.pairwise(data)
+            matrix = dist.pairwise(data, dtype=np.float32)
+            self.assertEqual(np.float32, matrix.dtype, msg="dtype differs: " + fname)
+            np.testing.assert_allclose(expected, matrix, rtol=1e-6, err_msg="distances differ: " + fname)
+
+
+def suite():
+    """
+    Returns the test suite.
+    :return: the test suite
+    :rtype: unittest.TestSuite
+    """
+    return unittest.TestLoader().loadTestsFromTestCase(TestDistances)
+
+
+if __name__ == '__main__':
+    jvm.start()
+    unittest.TextTestRunner().run(suite())
+    jvm.stop()
@@ -18,7 +18,7 @@ import unittest
 import weka.core.jvm as jvm
 import weka.core.typeconv as typeconv
 import wekatests.tests.weka_test as weka_test
-from jpype import JClass
+from jpype import JClass, JArray, JDouble, JInt
 
 
 class TestTypes(weka_test.WekaTest):
@@ -43,6 +43,19 @@ class TestTypes(weka_test.WekaTest):
         lout = typeconv.jenumeration_to_list(v.elements())
         self.assertEqual(lin, lout, msg="Elements differ")
 
+    def test_array_to_ndarray(self):
+        """
+        Tests methods jdouble_array_to_ndarray and jint_array_to_ndarray.
+        """
+        a = typeconv.jdouble_array_to_ndarray(JArray(JDouble)([1.5, 2.0, 3.5]))
+        self.assertEqual((3,), a.shape, msg="Shape differs")
+        self.assertEqual([1.5, 2.0, 3.5], a.tolist(), msg="Elements differ")
+        a = typeconv.jint_array_to_ndarray(JArray(JInt)([1, 2, 3]))
+        self.assertEqual((3,), a.shape, msg="Shape differs")
+        self.assertEqual([1.0, 2.0, 3.0], a.tolist(), msg="Elements differ")
+        self.assertIsNone(typeconv.jdouble_array_to_ndarray(None), msg="Should be None")
+        self.assertIsNone(typeconv.jint_array_to_ndarray(None), msg="Should be None")
+
 
 def suite():
     """